@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# Benchmark of the cold import of our widgets
+#
+# Every import runs in a fresh process, so nothing is cached by an earlier
+# one. PyQt5 itself is imported before the clock starts - every app that
+# embeds our widgets has it loaded anyway.
+# Besides the time we list the heavy modules that were pulled in, none of
+# them should show up before a camera or video is actually used.
+#
+# python Benchmarks/ImportTime.py [--runs 5]
+# ---------------------------------------------------------------------------
+import os
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+m_Modules = ["QtCamera.Camera", "QtMediaViewer.MediaViewer", "QtSnake.Game"]
+m_Heavy = ["cv2", "numpy", "pyaudio", "PIL", "pyzbar", "av"]
+
+
+def _Run(f_Module: str):
+    """ child process: import one module and print the result as json """
+    import time
+    import importlib
+    from PyQt5 import QtCore, QtGui, QtWidgets
+
+    _Start = time.perf_counter()
+    try:
+        importlib.import_module(f_Module)
+        _Error = ""
+    except Exception as e:
+        _Error = "{}: {}".format(type(e).__name__, e)
+    _Seconds = time.perf_counter() - _Start
+    _Loaded = [m for m in m_Heavy if m in sys.modules]
+    print(json.dumps({"seconds": _Seconds, "loaded": _Loaded, "error": _Error}))
+
+
+def main():
+    _Parser = argparse.ArgumentParser(description=__doc__)
+    _Parser.add_argument("--runs", type=int, default=5, help="fresh processes per module, the median is shown")
+    _Parser.add_argument("--module", help=argparse.SUPPRESS)
+    _Args = _Parser.parse_args()
+
+    if _Args.module:
+        _Run(_Args.module)
+        return
+
+    for _Module in m_Modules:
+        _Times = []
+        for _ in range(max(1, _Args.runs)):
+            _Output = subprocess.check_output([sys.executable, __file__, "--module", _Module])
+            _Result = json.loads(_Output.decode().strip().splitlines()[-1])
+            if _Result["error"] != "":
+                break
+            _Times.append(_Result["seconds"])
+
+        if _Result["error"] != "":
+            print("{:28} failed - {}".format(_Module, _Result["error"]))
+            continue
+        print("{:28} {:8.1f} ms   heavy modules: {}".format(_Module, statistics.median(_Times) * 1000, ", ".join(_Result["loaded"]) or "-"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# Benchmark of the picture decoding for previews
+#
+# Compares the old full decode + scaledToHeight against the reduced
+# resolution decode of Files_CalculatePreview.DecodeImage.
+# Every path runs in its own process, so the peak RSS belongs to it alone.
+#
+# python Benchmarks/PreviewDecode.py [folder with jpegs] [--height 150]
+# Without a folder some 24 MP test pictures are created in the temp folder.
+# ---------------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _PeakRSS() -> int:
+    """ peak resident set size of this process in MB, 0 if unknown """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    _Peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kB, macOS bytes
+    return _Peak // 1024 if sys.platform != "darwin" else _Peak // (1024 * 1024)
+
+
+def _CreatePictures(f_Folder: str, f_Count: int):
+    """ create some noisy 6000x4000 jpegs like a camera would """
+    import cv2
+    import numpy as np
+    os.makedirs(f_Folder, exist_ok=True)
+    for i in range(f_Count):
+        _Path = os.path.join(f_Folder, "Picture_{:03}.jpg".format(i))
+        if os.path.exists(_Path):
+            continue
+        _Image = cv2.resize(np.random.randint(0, 255, (400, 600, 3), np.uint8), (6000, 4000), interpolation=cv2.INTER_CUBIC)
+        cv2.imwrite(_Path, _Image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+
+
+def _Run(f_Mode: str, f_Files: list, f_Height: int):
+    """ child process: decode all files with one path and print the result as json """
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QImage
+    from QtMediaViewer.Threads import Files_CalculatePreview
+
+    _Start = time.perf_counter()
+    for _File in f_Files:
+        if f_Mode == "full":
+            _Image = QImage(_File).scaledToHeight(f_Height, Qt.FastTransformation)
+        else:
+            _Image = Files_CalculatePreview.DecodeImage(_File, f_Height)
+        assert not _Image.isNull(), _File
+    _Seconds = time.perf_counter() - _Start
+    print(json.dumps({"seconds": _Seconds, "rss": _PeakRSS()}))
+
+
+def main():
+    _Parser = argparse.ArgumentParser(description=__doc__)
+    _Parser.add_argument("folder", nargs="?", default=os.path.join(tempfile.gettempdir(), "QtMediaViewer", "Benchmark"))
+    _Parser.add_argument("--height", type=int, default=150)
+    _Parser.add_argument("--count", type=int, default=20, help="amount of test pictures to create")
+    _Parser.add_argument("--mode", help=argparse.SUPPRESS)
+    _Args = _Parser.parse_args()
+
+    if not os.path.isdir(_Args.folder) or len(os.listdir(_Args.folder)) == 0:
+        print("creating test pictures in", _Args.folder)
+        _CreatePictures(_Args.folder, _Args.count)
+    _Files = sorted(os.path.join(_Args.folder, f) for f in os.listdir(_Args.folder) if f.lower().endswith((".jpg", ".jpeg")))
+
+    if _Args.mode:
+        _Run(_Args.mode, _Files, _Args.height)
+        return
+
+    print("{} pictures, preview height {}".format(len(_Files), _Args.height))
+    for _Mode in ("full", "reduced"):
+        _Output = subprocess.check_output([sys.executable, __file__, _Args.folder, "--height", str(_Args.height), "--mode", _Mode])
+        _Result = json.loads(_Output.decode().strip().splitlines()[-1])
+        print("{:8} {:8.1f} pictures/s   peak RSS {:5} MB".format(_Mode, len(_Files) / _Result["seconds"], _Result["rss"]))
+
+
+if __name__ == "__main__":
+    main()
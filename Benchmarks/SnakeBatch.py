@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# Benchmark of the snake engines
+#
+# Plays random games with the single Engine and with the BatchEngine for
+# some batch sizes and prints board-steps per second. Finished boards are
+# started again, so every step advances all boards.
+#
+# python Benchmarks/SnakeBatch.py [--grid 25] [--steps 2000] [--boards 1 256 4096]
+# ---------------------------------------------------------------------------
+import os
+import sys
+import time
+import random
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from QtSnake.Engine import Engine
+from QtSnake.Batch import BatchEngine
+
+
+def _Engine(f_Grid: int, f_Steps: int) -> float:
+    """ board-steps per second of the single engine """
+    _Random = random.Random(1)
+    _Actions = [_Random.choice("NESW") if _Random.random() < 0.2 else "" for _ in range(f_Steps)]
+    _Engine = Engine((f_Grid, f_Grid), 1)
+    _Start = time.perf_counter()
+    for _Action in _Actions:
+        if _Engine.m_Over:
+            _Engine = Engine((f_Grid, f_Grid), _Engine.m_Seed + 1)
+        if _Action != "":
+            _Engine.Turn(_Action)
+        _Engine.Step()
+    return f_Steps / (time.perf_counter() - _Start)
+
+
+def _Batch(f_Grid: int, f_Steps: int, f_Boards: int) -> float:
+    """ board-steps per second of the batch engine """
+    _Random = np.random.default_rng(1)
+    _Actions = np.where(_Random.random((f_Steps, f_Boards)) < 0.2, _Random.integers(0, 4, (f_Steps, f_Boards)), -1)
+    _Batch = BatchEngine(f_Boards, (f_Grid, f_Grid), 1)
+    _Start = time.perf_counter()
+    for _Step in range(f_Steps):
+        _Batch.Step(_Actions[_Step])
+        if _Batch.m_Over.any():
+            _Batch.Reset(np.flatnonzero(_Batch.m_Over))
+    return f_Steps * f_Boards / (time.perf_counter() - _Start)
+
+
+def main():
+    _Parser = argparse.ArgumentParser(description=__doc__)
+    _Parser.add_argument("--grid", type=int, default=25, help="m_GameBoard_Grid of the game")
+    _Parser.add_argument("--steps", type=int, default=2000)
+    _Parser.add_argument("--boards", type=int, nargs="+", default=[1, 256, 4096])
+    _Args = _Parser.parse_args()
+
+    print("grid {0}x{0}, {1} steps".format(_Args.grid, _Args.steps))
+    print("{:16} {:12,.0f} board-steps/s".format("Engine", _Engine(_Args.grid, _Args.steps)))
+    for _Boards in _Args.boards:
+        print("{:16} {:12,.0f} board-steps/s".format("Batch x{}".format(_Boards), _Batch(_Args.grid, _Args.steps, _Boards)))
+
+
+if __name__ == "__main__":
+    main()
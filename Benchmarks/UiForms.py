@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# Benchmark of the .ui forms of our widgets
+#
+# Builds every form with uic.loadUi and with the cached LoadForm() of
+# QtShared.Forms. The first widget shows the startup cost (LoadForm compiles the
+# form there), the following ones the cost per instance.
+# Every path runs in its own process, so nothing is cached by the other.
+#
+# python Benchmarks/UiForms.py [--count 200]
+# ---------------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+m_Root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+m_Forms = [                                 # widget, .ui file
+    ["Game", "QtSnake/Interface/GameBoard.ui"],
+    ["GameOver", "QtSnake/Interface/GameOver.ui"],
+    ["Camera", "QtCamera/Interface/Camera.ui"],
+    ["PopUp_NewFolder", "QtCamera/Interface/PopUp-NewFolder.ui"],
+    ["PopUp_DeletePicture", "QtCamera/Interface/PopUp-Delete.ui"],
+    ["MediaViewer", "QtMediaViewer/Interface/MediaViewer.ui"],
+    ["QWidget_Header", "QtMediaViewer/Interface/List_Header.ui"],
+    ["PopUp_Delete", "QtMediaViewer/Interface/PopUp-Delete.ui"],
+    ["PopUp_Error", "QtMediaViewer/Interface/PopUp-Error.ui"],
+]
+
+
+def _Run(f_Mode: str, f_Index: int, f_Count: int):
+    """ child process: build one form f_Count times and print the result as json """
+    from PyQt5 import uic
+    from PyQt5.QtWidgets import QApplication, QWidget
+    _App = QApplication([])
+
+    _Widget, _File = m_Forms[f_Index]
+    _File = os.path.join(m_Root, _File)
+    if f_Mode == "loadUi":
+        _Load = uic.loadUi
+    else:
+        from QtShared.Forms import LoadForm
+        _Load = LoadForm
+
+    _Widgets = []
+    _Start = time.perf_counter()
+    _Widgets.append(QWidget())
+    _Load(_File, _Widgets[-1])
+    _First = time.perf_counter() - _Start
+
+    _Start = time.perf_counter()
+    for _ in range(f_Count):
+        _Widgets.append(QWidget())
+        _Load(_File, _Widgets[-1])
+    _Each = (time.perf_counter() - _Start) / max(1, f_Count)
+    print(json.dumps({"first": _First, "each": _Each}))
+
+
+def main():
+    _Parser = argparse.ArgumentParser(description=__doc__)
+    _Parser.add_argument("--count", type=int, default=200, help="widgets built after the first one")
+    _Parser.add_argument("--mode", help=argparse.SUPPRESS)
+    _Parser.add_argument("--form", type=int, help=argparse.SUPPRESS)
+    _Args = _Parser.parse_args()
+
+    if _Args.mode:
+        _Run(_Args.mode, _Args.form, _Args.count)
+        return
+
+    print("{:22} {:>20} {:>22}".format("", "first widget (ms)", "every further (ms)"))
+    print("{:22} {:>9} {:>10} {:>10} {:>11}".format("widget", "loadUi", "LoadForm", "loadUi", "LoadForm"))
+    for i, (_Widget, _File) in enumerate(m_Forms):
+        _Result = {}
+        for _Mode in ("loadUi", "LoadForm"):
+            try:
+                _Output = subprocess.check_output([sys.executable, __file__, "--mode", _Mode, "--form", str(i), "--count", str(_Args.count)],
+                                                  stderr=subprocess.DEVNULL)
+                _Result[_Mode] = json.loads(_Output.decode().strip().splitlines()[-1])
+            except (subprocess.CalledProcessError, ValueError):
+                _Result[_Mode] = None
+        if None in _Result.values():
+            print("{:22} failed".format(_Widget))
+            continue
+        print("{:22} {:9.2f} {:10.2f} {:10.2f} {:11.2f}".format(_Widget, _Result["loadUi"]["first"] * 1000, _Result["LoadForm"]["first"] * 1000,
+                                                                _Result["loadUi"]["each"] * 1000, _Result["LoadForm"]["each"] * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,26 +15,27 @@
 # pip install pyzbar
 # pip install ffmpeg-pythonm
 # pip install pyaudio
+# pip install av          # optional, records video without ffmpeg
 # ```
 
 # TODO: Open Preview picture Maybe in our own Picture viewer Widget?
 # m_Preview_Scale not needed anymore
 # ---------------------------------------------------------------------------
-import cv2
-import pyaudio
 import wave
 import tempfile
 import time
 import os
-import numpy as np
-from PIL import Image
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from glob import glob
-from pyzbar.pyzbar import decode
 
-from PyQt5 import QtWidgets, uic
+from PyQt5 import QtWidgets
 from PyQt5.QtCore import QTimer, pyqtSignal, QThread, Qt, QSize
 from PyQt5.QtGui import QImage, QPixmap, QIcon
-from PyQt5.QtMultimedia import QSound, QCamera
+from PyQt5.QtMultimedia import QSound
+
+# Qt >= 5.14 takes opencv frames without a color conversion
+FORMAT_BGR888 = getattr(QImage, "Format_BGR888", None)
 
 # try to get ImageGlass from QtMediaViewer
 try:
@@ -43,13 +44,28 @@ try:
 except:
     IMAGEGLASS_AVAILABLE = False
 
+# poster frames of videos are shared with QtMediaViewer
+try:
+    from ..QtMediaViewer.Poster import PosterFrame
+except:
+    try:
+        from QtMediaViewer.Poster import PosterFrame
+    except:
+        PosterFrame = None
+
+# every .ui file is compiled once per process
+try:
+    from ..QtShared.Forms import LoadForm
+except:
+    from QtShared.Forms import LoadForm
+
 """ POPUP Window for new folder creation """
 class PopUp_NewFolder(QtWidgets.QWidget):
     m_Signal_FolderName = pyqtSignal(str)
 
     def __init__(self, parent):
         super().__init__(parent)
-        uic.loadUi(os.path.dirname(os.path.realpath(__file__)) + '/Interface/PopUp-NewFolder.ui', self)
+        LoadForm(os.path.dirname(os.path.realpath(__file__)) + '/Interface/PopUp-NewFolder.ui', self)
         self.show()
 
         # center window
@@ -69,7 +85,7 @@ class PopUp_DeletePicture(QtWidgets.QWidget):
 
     def __init__(self, parent):
         super().__init__(parent)
-        uic.loadUi(os.path.dirname(os.path.realpath(__file__)) + '/Interface/PopUp-Delete.ui', self)
+        LoadForm(os.path.dirname(os.path.realpath(__file__)) + '/Interface/PopUp-Delete.ui', self)
         self.show()
 
         # center window
@@ -81,56 +97,219 @@ class PopUp_DeletePicture(QtWidgets.QWidget):
         self.pushButton_Save.clicked.connect(lambda e: self.deleteLater())
         self.pushButton_Close.clicked.connect(lambda e: self.deleteLater())
 
-""" QThread for recording Audio """
+""" QThread for recording Audio, every chunk is written to the wav file as it arrives """
 class AudioThread(QThread):
     m_Signal_Finished = pyqtSignal(str)     # returns the filename when finished
 
     m_Recording = True
-    m_Audio_Filename = tempfile.gettempdir() + "/" + str(int(time.time())) + ".wav"
-    m_Audio = pyaudio.PyAudio()
-    m_Audio_Frames = []
+    m_Audio_Filename = ""                   # wav file of the recording, only written without m_Sink
+    m_Audio = None                          # PyAudio instance, created with the first recording
+
+    m_Channels = 2
+    m_Rate = 44100
+    m_Chunk = 1024
+    m_Sink = None                           # callable(bytes, time) that gets the chunks instead of our wav file
+    m_Start = 0.0                           # time.perf_counter() when the recording started
 
     def run(self):
+        import pyaudio
+        if AudioThread.m_Audio is None:
+            AudioThread.m_Audio = pyaudio.PyAudio()
         self.m_Stream = self.m_Audio.open(format=pyaudio.paInt16,
-                                          channels=2,
-                                          rate=44100,
+                                          channels=self.m_Channels,
+                                          rate=self.m_Rate,
                                           input=True,
-                                          frames_per_buffer=1024)
+                                          frames_per_buffer=self.m_Chunk)
 
-        # start recording
+        waveFile = None
+        if self.m_Sink is None:
+            # unique name, recordings started in the same second don't share a file
+            _Handle, self.m_Audio_Filename = tempfile.mkstemp(suffix=".wav")
+            os.close(_Handle)
+            waveFile = wave.open(self.m_Audio_Filename, 'wb')
+            waveFile.setnchannels(self.m_Channels)
+            waveFile.setsampwidth(self.m_Audio.get_sample_size(pyaudio.paInt16))
+            waveFile.setframerate(self.m_Rate)
+
+        # start recording, memory stays the same no matter how long we record
         self.m_Stream.start_stream()
-        self.m_Audio_Frames = []
-        while self.m_Recording:
-            self.m_Audio_Frames.append(self.m_Stream.read(1024))
-            if not self.m_Recording:
-                break
+        self.m_Start = time.perf_counter()
+        try:
+            while self.m_Recording:
+                _Data = self.m_Stream.read(self.m_Chunk, exception_on_overflow=False)
+                if waveFile is None:
+                    self.m_Sink(_Data, time.perf_counter())
+                else:
+                    waveFile.writeframesraw(_Data)
+        finally:
+            self.m_Stream.stop_stream()
+            self.m_Stream.close()
+            if waveFile is not None:
+                waveFile.close()    # <- writes the final header sizes
 
+        self.m_Signal_Finished.emit(self.m_Audio_Filename)
 
     def stop(self):
-        """ Finishes the audio recording therefore the thread too"""
+        """ Finishes the audio recording therefore the thread too, the file is complete afterwards"""
         if self.m_Recording:
             self.m_Recording = False
-            self.m_Stream.stop_stream()
-            self.m_Stream.close()
-            #self.m_Audio.terminate()
+            self.wait()
 
-            waveFile = wave.open(self.m_Audio_Filename, 'wb')
-            waveFile.setnchannels(2)
-            waveFile.setsampwidth(self.m_Audio.get_sample_size(pyaudio.paInt16))
-            waveFile.setframerate(44100)
-            waveFile.writeframes(b''.join(self.m_Audio_Frames))
-            waveFile.close()
+""" QThread for scanning barcodes and qr codes beside the capture loop """
+class ScannerThread(QThread):
+    m_Signal_Codes = pyqtSignal(list)               # new codes found in a frame
+    m_Signal_Code = pyqtSignal(str, float, list)    # every new code: data, capture time, polygon [(x, y), ...] in the full frame
 
-            self.m_Signal_Finished.emit(self.m_Audio_Filename)
+    # config variables
+    m_Scan_Rate = 10                                # max scans per second
+    m_Scan_Width = 640                              # frames get downscaled to this width before scanning, 0 for full size
+    m_ROI = None                                    # (x, y, w, h) in parts of the frame (0.0 - 1.0), None for the full frame
+    m_Workers = 1                                   # threads that decode at the same time
+    m_Dedup_Window = 2.0                            # seconds a code is not reported again (cooldown per code)
+
+    def __init__(self, *args, **kwargs):
+        QThread.__init__(self)
+        self.m_Frame = None                         # latest (frame, capture time), older ones are skipped
+        self.m_Condition = threading.Condition()
+        self.m_Seen = {}                            # code -> time it was seen last, only codes within their cooldown
+        self.m_Seen_Pruned = time.monotonic()       # last time we removed codes with a finished cooldown from m_Seen
+        self.m_Started = time.monotonic()
+        self.m_Lock = threading.Lock()              # m_Scans is counted by the pool threads
+
+        # counters
+        self.m_Scans = 0                            # frames scanned
+        self.m_Codes_Reported = 0                   # codes emitted
+        self.m_Codes_Suppressed = 0                 # codes seen again within their cooldown
+
+    def Submit(self, f_CV_Img, f_Time: float = 0.0):
+        """
+        hand over a frame without blocking the capture loop
+        :param f_CV_Img: BGR frame, must not be changed afterwards
+        :param f_Time: capture time (time.time()), 0 for now
+        """
+        with self.m_Condition:
+            self.m_Frame = (f_CV_Img, f_Time or time.time())
+            self.m_Condition.notify()
+
+    def Statistics(self) -> dict:
+        """
+        counters of our scanner
+        :return: dict with scans, reported and suppressed codes and reported codes per minute
+        """
+        _Minutes = max(time.monotonic() - self.m_Started, 1.0) / 60
+        with self.m_Lock:
+            _Scans = self.m_Scans
+        return {"scans": _Scans,
+                "codes": self.m_Codes_Reported,
+                "suppressed": self.m_Codes_Suppressed,
+                "codes_per_minute": self.m_Codes_Reported / _Minutes}
+
+    def Stop(self):
+        """ stop scanning """
+        self.requestInterruption()
+        with self.m_Condition:
+            self.m_Condition.notify()
+
+    def run(self):
+        _Pool = ThreadPoolExecutor(max_workers=self.m_Workers) if self.m_Workers > 1 else None
+        _Running = []
+        _Next = time.perf_counter()
+        while not self.isInterruptionRequested():
+            # scan rate
+            _Now = time.perf_counter()
+            if _Next > _Now:
+                self.msleep(int((_Next - _Now) * 1000))
+            _Next = max(_Next, _Now) + 1.0 / self.m_Scan_Rate
+
+            with self.m_Condition:
+                while self.m_Frame is None and not self.isInterruptionRequested():
+                    self.m_Condition.wait(0.5)
+                _Frame, self.m_Frame = self.m_Frame, None
+            if _Frame is None:
+                break
+
+            if _Pool is None:
+                self._Report(*self._Scan(*_Frame))
+                continue
+
+            # keep at most m_Workers frames in work
+            _Running.append(_Pool.submit(self._Scan, *_Frame))
+            if len(_Running) >= self.m_Workers:
+                _Done, _Pending = wait(_Running, return_when=FIRST_COMPLETED)
+                for _Future in _Done:
+                    self._Report(*_Future.result())
+                _Running = list(_Pending)
+
+        if _Pool is not None:
+            _Pool.shutdown(wait=False)
+
+    def _Scan(self, f_CV_Img, f_Time: float) -> tuple:
+        """
+        gray, cropped and downscaled decode of a frame
+        :param f_CV_Img: BGR frame
+        :param f_Time: capture time of the frame
+        :return: list of [data, polygon in the full frame], capture time
+        """
+        import cv2
+        from pyzbar.pyzbar import decode
+        _X, _Y = 0, 0
+        if self.m_ROI is not None:
+            h, w = f_CV_Img.shape[:2]
+            x, y, rw, rh = self.m_ROI
+            _X, _Y = int(x * w), int(y * h)
+            f_CV_Img = f_CV_Img[_Y:int((y + rh) * h), _X:int((x + rw) * w)]
+        _Gray = cv2.cvtColor(f_CV_Img, cv2.COLOR_BGR2GRAY)
+        _Scale = 1.0
+        if 0 < self.m_Scan_Width < _Gray.shape[1]:
+            _Scale = _Gray.shape[1] / self.m_Scan_Width
+            _Gray = cv2.resize(_Gray, (self.m_Scan_Width, int(_Gray.shape[0] / _Scale)), interpolation=cv2.INTER_AREA)
+
+        _Codes = []
+        for _Code in decode(_Gray):
+            _Polygon = [(int(_X + p.x * _Scale), int(_Y + p.y * _Scale)) for p in getattr(_Code, "polygon", [])]
+            _Codes.append([_Code.data.decode('utf-8'), _Polygon])
+        with self.m_Lock:
+            self.m_Scans += 1
+        return _Codes, f_Time
+
+    def _Report(self, f_Codes: list, f_Time: float):
+        """
+        emit all codes that were not seen within their cooldown
+        :param f_Codes: list of [data, polygon]
+        :param f_Time: capture time of the frame
+        """
+        _Now = time.monotonic()
+
+        # codes with a finished cooldown are reported like new ones, we don't have to keep them
+        if _Now - self.m_Seen_Pruned >= self.m_Dedup_Window:
+            self.m_Seen = {d: t for d, t in self.m_Seen.items() if _Now - t < self.m_Dedup_Window}
+            self.m_Seen_Pruned = _Now
+
+        _List = []
+        for _Data, _Polygon in f_Codes:
+            if _Now - self.m_Seen.get(_Data, -self.m_Dedup_Window) >= self.m_Dedup_Window and _Data not in _List:
+                _List.append(_Data)
+                self.m_Codes_Reported += 1
+                self.m_Signal_Code.emit(_Data, f_Time, _Polygon)
+            elif _Data not in _List:
+                self.m_Codes_Suppressed += 1
+            self.m_Seen[_Data] = _Now
+        if len(_List) > 0:
+            self.m_Signal_Codes.emit(_List)
 
 """ QThread for Video recording and viewer frame """
 class VideoThread(QThread):
     # define some signals
-    m_Signal_Frame = pyqtSignal(np.ndarray)         # signal that contains the image
+    m_Signal_Frame = pyqtSignal(object)             # signal that contains the raw image (np.ndarray), only emitted if connected
+    m_Signal_Frame_Ready = pyqtSignal()             # new image in our mailbox, get it with TakeFrame()
     m_Signal_CamerasAvailable = pyqtSignal(list)    # signal available cameras
     m_Signal_Codes = pyqtSignal(list)                # signal qr codes
-    m_Signal_Picture_Taken = pyqtSignal(str)        # signal returns name of picture
+    m_Signal_Code = pyqtSignal(str, float, list)    # signal every new code with capture time and polygon
+    m_Signal_Picture_Taken = pyqtSignal(str)        # signal returns name of picture when it is saved
+    m_Signal_Picture_Saved = pyqtSignal(str, QImage)    # signal returns name and preview of a saved picture
+    m_Signal_Series = pyqtSignal(dict)              # signal statistics of a finished burst or timelapse
     m_Signal_Video_Taken = pyqtSignal(str)          # video # signal returns name of picture
+    m_Signal_Video_Failed = pyqtSignal(str)         # error message if a video could not be recorded
 
     # config variables
     m_Barcode_Scan = True
@@ -138,65 +317,203 @@ class VideoThread(QThread):
     m_Preview_Scale = 100
     m_Force_Cam = 0
     m_RotatePicture = 0
+    m_Picture_Quality = 95                          # jpeg quality
+    m_ConvertPDF = False                            # save pictures as pdf
+    m_Barcode_Scan_Rate = 10                        # see ScannerThread
+    m_Barcode_Scan_Width = 640
+    m_Barcode_ROI = None
+    m_Barcode_Workers = 1
+    m_Barcode_Cooldown = 2.0
+    m_Barcode_Continuous = False                    # keep the camera running after codes were found
+    m_Preview_Size = QSize()                        # size of our viewer, invalid for the full frame
+    m_Ring_Size = 3                                 # preallocated preview buffers
+    m_Target_FPS = 30                               # max frames per second we process, 0 for camera speed
+    m_Camera_Standby = None                         # see CameraManager.m_Standby, None keeps its setting
+
+    # counters
+    m_Frames_Captured = 0                           # frames read from camera
+    m_Frames_Delivered = 0                          # frames taken by the gui
+    m_Frames_Dropped = 0                            # frames replaced in the mailbox before the gui took them
+
+    # burst and timelapse
+    m_Series_Remaining = 0                          # pictures left, -1 for endless (timelapse)
+    m_Series_Interval = 0.0                         # seconds between two pictures
+    m_Series_Next = 0.0                             # time.perf_counter() of the next picture
+
+    # single slot between capture and gui thread
+    m_Mailbox = None
 
     # class vars
     m_Cameras_Available = []
     m_Camera_Current = 0
     m_Camera_Run = True
+    m_Camera_Request = None                         # camera index the loop should switch to
     m_Video_Recording_Started = False
 
+    def __init__(self, *args, **kwargs):
+        QThread.__init__(self)
+        self.m_Mailbox_Lock = threading.Lock()
+        self.m_Series_Lock = threading.Lock()           # m_Series_* is changed by the gui and the camera loop
+
     def run(self):
+        from .Service import CaptureService
+        from .Devices import CameraManager
+        if self.m_Camera_Standby is not None:
+            CameraManager.m_Standby = self.m_Camera_Standby
+
         # get available cameras
         self.m_Cameras_Available = self._GetAvailableCameras()
 
-        # start cam
+        # start cam, the capture service opens it if no other widget uses it already
         self.m_Camera_Run = True
         if self.m_Force_Cam in self.m_Cameras_Available:
             self.m_Camera_Current = self.m_Force_Cam
         else:
             self.m_Camera_Current = 0
-        self.m_Cap = cv2.VideoCapture(self.m_Camera_Current, cv2.CAP_DSHOW)
-        self.m_Cap.set(3, 1280)
-        self.m_Cap.set(4, 720)
+        self.m_Camera_Request = None
+        self.m_Subscription = CaptureService.Subscribe(self.m_Camera_Current, self.m_Target_FPS)
 
         # send that cam is read
         self.m_Signal_CamerasAvailable.emit(self.m_Cameras_Available)
 
         while self.m_Camera_Run:
-            # get image from cam
-            ret, self.m_CV_Img = self.m_Cap.read()
+            # camera was changed
+            if self.m_Camera_Request is not None:
+                CaptureService.Unsubscribe(self.m_Subscription, False)     # keep the standby of the next camera
+                self.m_Subscription = CaptureService.Subscribe(self.m_Camera_Request, self.m_Target_FPS)
+                self.m_Camera_Request = None
+
+            # our frame rate, a fast burst may take more frames
+            _FPS = self.m_Target_FPS
+            if _FPS > 0 and self.m_Series_Remaining != 0 and self.m_Series_Interval > 0:
+                _FPS = max(_FPS, 1.0 / self.m_Series_Interval)
+            self.m_Subscription.m_FPS = _FPS
 
-            if ret != True: # continue if cam is not ready
+            # get image from cam
+            _CV_Img, _Captured, _Captured_Clock = self.m_Subscription.Read()
+            if _CV_Img is None: # cam is not ready
                 continue
+            self.m_CV_Img = _CV_Img
+            self.m_Frames_Captured += 1
 
-            # resize image to a scale factor
-            #_Width = int(self.m_CV_Img.shape[1] * self.m_Preview_Scale / 100)
-            #_Height = int(self.m_CV_Img.shape[0] * self.m_Preview_Scale / 100)
+            self._DeliverFrame(self.m_CV_Img)
 
-            # resize image
-            #_Resized = cv2.resize(self.m_CV_Img, (_Width, _Height), interpolation=cv2.INTER_AREA)
-            self.m_Signal_Frame.emit(self.m_CV_Img)
+            if self.m_Series_Remaining != 0 and _Captured_Clock >= self.m_Series_Next:
+                self._SeriesFrame(_Captured_Clock)
 
             if self.m_Video_Recording_Started == True:
-                self.m_Video_Writer.write(self.m_CV_Img)
+                self.m_Thread_Recorder.PushFrame(self.m_CV_Img, _Captured_Clock)
                 continue # <- we skip barcode scanning in video recording mode
 
             # continue if no barcodes to scan
             if self.m_Barcode_Scan == False:
                 continue
 
-            # scan for qr and barcode
-            _Codes = decode(self.m_CV_Img)
-            if len(_Codes) > 0:
-                _List = []
-                for _Code in _Codes:
-                    _List.append(_Code.data.decode('utf-8'))
-                self.m_Signal_Codes.emit(_List)
-                self.StopCamera()
+            # scan for qr and barcode in our scanner thread, read() gives us a new array every time
+            if not hasattr(self, "m_Thread_Scanner"):
+                self.m_Thread_Scanner = ScannerThread()
+                self.m_Thread_Scanner.m_Scan_Rate = self.m_Barcode_Scan_Rate
+                self.m_Thread_Scanner.m_Scan_Width = self.m_Barcode_Scan_Width
+                self.m_Thread_Scanner.m_ROI = self.m_Barcode_ROI
+                self.m_Thread_Scanner.m_Workers = self.m_Barcode_Workers
+                self.m_Thread_Scanner.m_Dedup_Window = self.m_Barcode_Cooldown
+                self.m_Thread_Scanner.m_Signal_Codes.connect(self._CodesScanned, Qt.DirectConnection)
+                self.m_Thread_Scanner.m_Signal_Code.connect(self.m_Signal_Code, Qt.DirectConnection)
+                self.m_Thread_Scanner.start()
+            self.m_Thread_Scanner.Submit(self.m_CV_Img, _Captured)
+
+        # camera loop stopped
+        if hasattr(self, "m_Thread_Scanner"):
+            self.m_Thread_Scanner.Stop()
+            self.m_Thread_Scanner.wait()
+            del self.m_Thread_Scanner
+        CaptureService.Unsubscribe(self.m_Subscription)
+
+    def _CodesScanned(self, f_Codes: list):
+        """
+        codes were found by our scanner, runs in the scanner thread
+        :param f_Codes: list with all found codes
+        """
+        if not self.m_Camera_Run:
+            return
+        self.m_Signal_Codes.emit(f_Codes)
+        if not self.m_Barcode_Continuous:
+            self.m_Camera_Run = False
+
+    def _DeliverFrame(self, f_CV_Img):
+        """
+        scale and convert the frame for our viewer here and not in the gui thread
+        the emitted QImage points into our ring buffer, so the gui gets it without a copy
+        :param f_CV_Img: BGR frame of the camera
+        """
+        import cv2
+        import numpy as np
+        if self.receivers(self.m_Signal_Frame) > 0:
+            self.m_Signal_Frame.emit(f_CV_Img)
+
+        h, w = f_CV_Img.shape[:2]
+        _Size = self.m_Preview_Size
+        if _Size.width() > 0 and _Size.height() > 0:
+            _Scale = min(_Size.width() / w, _Size.height() / h)
+            w, h = max(1, int(w * _Scale)), max(1, int(h * _Scale))
+
+        # new viewer size: old buffers may still be queued for the gui, so we keep them a little longer
+        if not hasattr(self, "m_Ring") or self.m_Ring[0].shape[:2] != (h, w):
+            if hasattr(self, "m_Ring"):
+                self.m_Ring_Retired = [self.m_Ring] + getattr(self, "m_Ring_Retired", [])[:1]
+            self.m_Ring = [np.empty((h, w, 3), np.uint8) for _ in range(self.m_Ring_Size)]
+            self.m_Ring_Index = 0
+        _Buffer = self.m_Ring[self.m_Ring_Index]
+        self.m_Ring_Index = (self.m_Ring_Index + 1) % self.m_Ring_Size
+
+        _Interpolation = cv2.INTER_AREA if w < f_CV_Img.shape[1] else cv2.INTER_LINEAR
+        if FORMAT_BGR888 is not None:
+            cv2.resize(f_CV_Img, (w, h), dst=_Buffer, interpolation=_Interpolation)
+            _Format = FORMAT_BGR888
+        else:
+            cv2.cvtColor(cv2.resize(f_CV_Img, (w, h), interpolation=_Interpolation), cv2.COLOR_BGR2RGB, dst=_Buffer)
+            _Format = QImage.Format_RGB888
+        # latest frame wins: the gui is only notified if the mailbox was empty
+        with self.m_Mailbox_Lock:
+            _Empty = self.m_Mailbox is None
+            if not _Empty:
+                self.m_Frames_Dropped += 1
+            self.m_Mailbox = QImage(_Buffer.data, w, h, _Buffer.strides[0], _Format)
+        if _Empty:
+            self.m_Signal_Frame_Ready.emit()
+
+    def TakeFrame(self) -> QImage:
+        """
+        get the latest preview image and empty the mailbox
+        the image points into our ring buffer, convert it right away
+        :return: image or None if there is no new one
+        """
+        with self.m_Mailbox_Lock:
+            _Image = self.m_Mailbox
+            self.m_Mailbox = None
+        if _Image is not None:
+            self.m_Frames_Delivered += 1
+        return _Image
+
+    def Statistics(self) -> dict:
+        """
+        counters of our frame pipeline and of the scanner while it runs
+        :return: dict with captured, delivered and dropped frames, frames skipped by our frame rate
+                 and missed while we were busy (and ScannerThread.Statistics())
+        """
+        _Statistics = {"captured": self.m_Frames_Captured,
+                       "delivered": self.m_Frames_Delivered,
+                       "dropped": self.m_Frames_Dropped}
+        if hasattr(self, "m_Subscription"):
+            _Statistics["skipped"] = self.m_Subscription.m_Skipped
+            _Statistics["missed"] = self.m_Subscription.m_Missed
+        if hasattr(self, "m_Thread_Scanner"):
+            _Statistics.update(self.m_Thread_Scanner.Statistics())
+        return _Statistics
 
     def TakePicture(self) -> str:
         """
-         take/save a picture
+         take a picture, it is saved in the background by our PictureWriter
         :return: path to file
         """
         if not hasattr(self, "m_CV_Img"): # webcam is not loaded
@@ -206,19 +523,77 @@ class VideoThread(QThread):
         if not os.path.exists(self.m_Path_Save):
             os.makedirs(self.m_Path_Save)
 
-        try:
-            _Filename = self.m_Path_Save + '\\' + str(int(time.time())) + '.jpg'
-            if self.m_RotatePicture == 90:
-                self.m_CV_Img = cv2.rotate(self.m_CV_Img, cv2.ROTATE_90_CLOCKWISE)
-            if self.m_RotatePicture == 180:
-                self.m_CV_Img = cv2.rotate(self.m_CV_Img, cv2.ROTATE_180)
-            if self.m_RotatePicture == 270:
-                self.m_CV_Img = cv2.rotate(self.m_CV_Img, cv2.ROTATE_90_COUNTERCLOCKWISE)
-            cv2.imwrite(_Filename, self.m_CV_Img)
-            self.m_Signal_Picture_Taken.emit(_Filename)
-            return _Filename
-        except Exception as e:
-            print(e)
+        # read() gives us a new array for every frame, so we can hand over ours without a copy
+        _Writer = self._Writer()
+        return _Writer.Save(self.m_CV_Img, _Writer.NextFilename(self.m_Path_Save))
+
+    def StartBurst(self, f_Count: int, f_FPS: float):
+        """
+        take f_Count pictures with f_FPS pictures per second
+        :param f_Count: amount of pictures
+        :param f_FPS: pictures per second, limited by the camera
+        """
+        self._StartSeries(f_Count, 1.0 / f_FPS if f_FPS > 0 else 0.0)
+
+    def StartTimelapse(self, f_Interval: float):
+        """
+        take a picture every f_Interval seconds until StopSeries() is called
+        :param f_Interval: seconds between two pictures
+        """
+        self._StartSeries(-1, f_Interval)
+
+    def StopSeries(self):
+        """ stop a running burst or timelapse """
+        with self.m_Series_Lock:
+            _Running = self.m_Series_Remaining != 0
+            self.m_Series_Remaining = 0
+        if _Running:
+            self._Writer().EndSeries()
+
+    def _StartSeries(self, f_Count: int, f_Interval: float):
+        """ prepare our counters, the pictures are taken in the camera loop """
+        if not os.path.exists(self.m_Path_Save):
+            os.makedirs(self.m_Path_Save)
+        self._Writer().StartSeries()
+        with self.m_Series_Lock:
+            self.m_Series_Interval = f_Interval
+            self.m_Series_Next = time.perf_counter()
+            self.m_Series_Remaining = f_Count
+
+    def _SeriesFrame(self, f_Time: float):
+        """
+        take the picture of a series, runs in the camera loop
+        :param f_Time: capture time of the current frame
+        """
+        _Writer = self._Writer()
+        with self.m_Series_Lock:
+            if self.m_Series_Remaining == 0:    # stopped by the gui in the meantime
+                return
+            _Writer.Save(self.m_CV_Img, _Writer.NextFilename(self.m_Path_Save))
+
+            # stay on the grid of our interval, slots we missed are skipped
+            self.m_Series_Next += self.m_Series_Interval
+            if self.m_Series_Next <= f_Time:
+                self.m_Series_Next = f_Time + self.m_Series_Interval
+            _Last = self.m_Series_Remaining == 1
+            if self.m_Series_Remaining > 0:
+                self.m_Series_Remaining -= 1
+        if _Last:
+            _Writer.EndSeries()
+
+    def _Writer(self):
+        """ our picture writer (PictureWriter) with the current settings """
+        if not hasattr(self, "m_Writer"):
+            from .Pictures import PictureWriter
+            self.m_Writer = PictureWriter()
+            self.m_Writer.m_Signal_Saved.connect(self.m_Signal_Picture_Saved)
+            self.m_Writer.m_Signal_Saved.connect(lambda f, i: self.m_Signal_Picture_Taken.emit(f))
+            self.m_Writer.m_Signal_Series.connect(self.m_Signal_Series)
+        self.m_Writer.m_Rotate = self.m_RotatePicture
+        self.m_Writer.m_Quality = self.m_Picture_Quality
+        self.m_Writer.m_ConvertPDF = self.m_ConvertPDF
+        self.m_Writer.m_Preview_Width = self.m_Preview_Scale
+        return self.m_Writer
 
     def RecordVideo(self):
         """ record a video """
@@ -229,99 +604,104 @@ class VideoThread(QThread):
         if not os.path.exists(self.m_Path_Save):
             os.makedirs(self.m_Path_Save)
 
-        # if recording is running we stop it here
+        # if recording is running we stop it here, the recorder finishes the file in its own thread
         if self.m_Video_Recording_Started == True:
             self.m_Video_Recording_Started = False
-            self.m_Video_Writer.release()
             self.m_Thread_Audio.stop()
-
-            # merge video and audio
-            import subprocess
-            import shutil
-            _Temp_File = tempfile.gettempdir() + "/" + str(int(time.time())) + '.mp4'
-            cmd = os.path.dirname(os.path.realpath(__file__)) + "/ffmpeg.exe -y -ac 2 -channel_layout stereo -i \"" + self.m_Thread_Audio.m_Audio_Filename + "\" -i \"" + self.m_Video_Temp_Filename + "\" -pix_fmt yuv420p \"" + _Temp_File + "\""
-            cmd = os.path.dirname(os.path.realpath(__file__)) + '/ffmpeg.exe -i "{}" -i {} -y -vcodec copy "{}"'.format(self.m_Thread_Audio.m_Audio_Filename, self.m_Video_Temp_Filename, _Temp_File)
-            subprocess.call(cmd, shell=True)
-
-            shutil.copyfile(_Temp_File, self.m_Video_Filename)
-            try:
-                os.remove(self.m_Thread_Audio.m_Audio_Filename)
-                os.remove(self.m_Video_Temp_Filename)
-                os.remove(_Temp_File)
-            except:
-                pass
-            self.m_Signal_Video_Taken.emit(self.m_Video_Filename)
+            self.m_Thread_Recorder.Stop()
             return
 
-        # prepare our writer
-        _Width = int(self.m_Cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        _Height = int(self.m_Cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        # prepare our recorder
+        _Height, _Width = self.m_CV_Img.shape[:2]
 
         self.m_Video_Filename = self.m_Path_Save + '\\' + str(int(time.time())) + '.mp4'
-
-        # start recording in a temp filename
-        self.m_Video_Temp_Filename = tempfile.gettempdir() + "/" + str(int(time.time())) + '.mp4'
-        self.m_Video_Writer = cv2.VideoWriter(self.m_Video_Temp_Filename, cv2.VideoWriter_fourcc(*'DIVX'), 10, (_Width, _Height))
+        from .Recorder import MediaRecorder
+        try:
+            self.m_Thread_Recorder = MediaRecorder(self.m_Video_Filename, _Width, _Height)
+        except RuntimeError as e:
+            self.m_Signal_Video_Failed.emit(str(e))
+            return
+        self.m_Thread_Recorder.m_Signal_Finished.connect(self.m_Signal_Video_Taken)
+        self.m_Thread_Recorder.m_Signal_Failed.connect(self._RecordingFailed)
+        self.m_Thread_Recorder.start()
         self.m_Video_Recording_Started = True
 
         # start audio recording
         self.m_Thread_Audio = AudioThread()
+        self.m_Thread_Audio.m_Channels = self.m_Thread_Recorder.m_Channels
+        self.m_Thread_Audio.m_Rate = self.m_Thread_Recorder.m_Rate
+        self.m_Thread_Audio.m_Sink = self.m_Thread_Recorder.PushAudio
         self.m_Thread_Audio.start()
 
+    def _RecordingFailed(self, f_Error: str):
+        """
+        the recorder could not write the video, a running recording is stopped
+        :param f_Error: error message of the recorder
+        """
+        if self.sender() is self.m_Thread_Recorder and self.m_Video_Recording_Started == True:
+            self.m_Video_Recording_Started = False
+            self.m_Thread_Audio.stop()
+        self.m_Signal_Video_Failed.emit(f_Error)
+
     def StopCamera(self):
-        """ stop camera """
+        """ stop camera, the capture is released when the camera loop ends """
         self.m_Camera_Run = False
-        self.m_Cap.release()
+        if getattr(self, "m_Subscription", None) is not None:
+            self.m_Subscription.Wake()
 
     def ChangeCamera(self):
         """ change camera index """
         self.m_Camera_Current = 0 if self.m_Camera_Current >= len(self.m_Cameras_Available)-1 else self.m_Camera_Current+1
-        self.m_Cap = cv2.VideoCapture(self.m_Camera_Current, cv2.CAP_DSHOW)
+        self.m_Camera_Request = self.m_Camera_Current
 
     def _GetAvailableCameras(self):
         """
         get all available cameras
         :return: list with all available camera indexes
         """
-        _Cameras = []
-        _i = 0
-        while _i < len(QCamera.availableDevices()):
-            _Cameras.append(_i)
-            _i += 1
-
-        return _Cameras
+        from .Devices import CameraManager
+        return CameraManager.Devices()
 
 """ QWidget Class for using Camera """
 class Camera(QtWidgets.QWidget):
     # Configurations
     m_Barcode_Scan_Active = False                   # True/False - activates barcode/qrscan
+    m_Barcode_Scan_Rate = 10                        # max barcode scans per second
+    m_Barcode_Scan_Width = 640                      # frames are downscaled to this width for scanning, 0 for full size
+    m_Barcode_ROI = None                            # (x, y, w, h) part of the frame to scan (0.0 - 1.0), None for all
+    m_Barcode_Workers = 1                           # threads scanning at the same time
+    m_Barcode_Cooldown = 2.0                        # seconds the same code is not reported again
+    m_Barcode_Continuous = False                    # True: camera keeps running and streams codes via m_Signal_Barcode
     m_Sound_Active = True                           # True/False - activates sound
     m_Path_Save = "/"                               # Path where pictures should be saved
     m_Show_Preview = True                           # hide or show the taken pictures
     m_Show_Folders = True                           # hide or show the folder tree
     m_ConvertPDF = False                            # convert taken image to a pdf
     m_RotatePicture = 0                             # rotate taken picture (90, 180, 270)
+    m_Picture_Quality = 95                          # jpeg quality of taken pictures
     m_Preview_Scale = 350                           # scale factor of the preview window
 
     m_Force_Cam = 0                                 # force a specific camera to be used
+    m_Camera_Standby = False                        # keep the next camera open, switching is instant
     m_Kill_Timer = 5*60*1000                        # force the cam to shutdown
 
 
     # signals
     m_Signal_Barcode_Found = pyqtSignal(list)       # signal if a barcodes was found
+    m_Signal_Barcode = pyqtSignal(str, float, list) # signal every new code with capture time and polygon
     m_Signal_Kill = pyqtSignal(bool)                # signal that gets triggerd when camera gets killed
     m_Signal_Picture_Taken = pyqtSignal(str)        # signal returns file name
     m_Signal_Video_Taken = pyqtSignal(str)          # signal returns file name
+    m_Signal_Video_Failed = pyqtSignal(str)         # signal returns the error message if a video could not be recorded
+    m_Signal_Series_Finished = pyqtSignal(dict)     # signal burst/timelapse finished: written, dropped, fps
 
     # Status and cache vars
     m_Cameras_Available = []                        # list of all available camera indexes
 
-    # Threads
-    m_Thread_Video = VideoThread()
-
     def __init__(self, *args, **kwargs):
         QtWidgets.QWidget.__init__(self)
-        uic.loadUi(os.path.dirname(os.path.realpath(__file__)) + '/Interface/Camera.ui', self)
+        self.m_Thread_Video = VideoThread()     # every widget has its own, the camera is shared by CaptureService
+        LoadForm(os.path.dirname(os.path.realpath(__file__)) + '/Interface/Camera.ui', self)
 
         # if valid **kwargs are available we set class vars
         for _Key in kwargs:
@@ -365,19 +745,31 @@ class Camera(QtWidgets.QWidget):
             self.Frame_Right.show()
 
         # start camera thread
+        self.m_Thread_Video.m_Camera_Standby = self.m_Camera_Standby
         self.m_Thread_Video.m_Path_Save = self.m_Path_Save
         self.m_Thread_Video.m_Barcode_Scan = self.m_Barcode_Scan_Active
         self.m_Thread_Video.m_Sound_Active = self.m_Sound_Active
         self.m_Thread_Video.m_Preview_Scale = self.m_Preview_Scale
         self.m_Thread_Video.m_Force_Cam = self.m_Force_Cam
         self.m_Thread_Video.m_RotatePicture = self.m_RotatePicture
+        self.m_Thread_Video.m_Picture_Quality = self.m_Picture_Quality
+        self.m_Thread_Video.m_ConvertPDF = self.m_ConvertPDF
+        self.m_Thread_Video.m_Barcode_Scan_Rate = self.m_Barcode_Scan_Rate
+        self.m_Thread_Video.m_Barcode_Scan_Width = self.m_Barcode_Scan_Width
+        self.m_Thread_Video.m_Barcode_ROI = self.m_Barcode_ROI
+        self.m_Thread_Video.m_Barcode_Workers = self.m_Barcode_Workers
+        self.m_Thread_Video.m_Barcode_Cooldown = self.m_Barcode_Cooldown
+        self.m_Thread_Video.m_Barcode_Continuous = self.m_Barcode_Continuous
 
         # connect signals
-        self.m_Thread_Video.m_Signal_Frame.connect(self._UpdateFrame)   # updates frame
+        self.m_Thread_Video.m_Signal_Frame_Ready.connect(self._UpdateFrame)   # updates frame
         self.m_Thread_Video.m_Signal_CamerasAvailable.connect(self._UpdateAvailableCameras) # updates interfac
         self.m_Thread_Video.m_Signal_Codes.connect(self._CodesFound)    # some barcodes found
-        self.m_Thread_Video.m_Signal_Picture_Taken.connect(self._PictureTaken)  # picture was taken
+        self.m_Thread_Video.m_Signal_Code.connect(self.m_Signal_Barcode)    # stream of single codes
+        self.m_Thread_Video.m_Signal_Picture_Saved.connect(self._PictureTaken)  # picture was taken
         self.m_Thread_Video.m_Signal_Video_Taken.connect(self._VideoTaken)  # picture was taken
+        self.m_Thread_Video.m_Signal_Video_Failed.connect(self._VideoFailed)  # video could not be recorded
+        self.m_Thread_Video.m_Signal_Series.connect(self.m_Signal_Series_Finished)  # burst or timelapse finished
 
         self.m_Thread_Video.start()
 
@@ -421,6 +813,9 @@ class Camera(QtWidgets.QWidget):
             QSound.play(os.path.dirname(os.path.realpath(__file__)) + "/Sounds/Scan.wav")
 
         self.m_Signal_Barcode_Found.emit(f_Result)
+        if self.m_Barcode_Continuous:
+            self.m_Timer_Kill.start(self.m_Kill_Timer)  # still in use
+            return
         self._KillCamera()
 
     def _VideoTaken(self, f_Result:str):
@@ -433,17 +828,23 @@ class Camera(QtWidgets.QWidget):
             QSound.play(os.path.dirname(os.path.realpath(__file__)) + "/Sounds/Shutter.wav")
 
         # get frame for thumbnail
-        _Cap = cv2.VideoCapture(f_Result)
-        _Tot_Frames = int(_Cap.get(cv2.CAP_PROP_FRAME_COUNT) * 0.94)
-        if not _Cap.isOpened() and _Tot_Frames <= 0: # something went wrong
+        if PosterFrame is not None:
+            convert_to_Qt_format = PosterFrame.Extract(f_Result, f_Width=350)
+        else:
+            import cv2
+            _Cap = cv2.VideoCapture(f_Result)
+            _Ret, _Image = _Cap.read()
+            _Cap.release()
+            convert_to_Qt_format = QImage()
+            if _Ret:
+                h, w = _Image.shape[:2]
+                if FORMAT_BGR888 is not None:
+                    convert_to_Qt_format = QImage(_Image.data, w, h, _Image.strides[0], FORMAT_BGR888)
+                else:
+                    convert_to_Qt_format = QImage(_Image.data, w, h, _Image.strides[0], QImage.Format_RGB888).rgbSwapped()
+                convert_to_Qt_format = convert_to_Qt_format.scaledToWidth(350, Qt.FastTransformation)
+        if convert_to_Qt_format.isNull(): # something went wrong
             return
-        _Cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-        _, _Image = _Cap.retrieve()
-
-        rgb_image = cv2.cvtColor(_Image, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        convert_to_Qt_format = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888).scaledToWidth(350, Qt.FastTransformation)
 
         _Frame = QtWidgets.QFrame()
         _Frame.setStyleSheet("background: #FFF;border: 1px solid #AAA ;margin: 5px 0px;")
@@ -476,15 +877,13 @@ class Camera(QtWidgets.QWidget):
         _VLayout.addWidget(_Button)
         self.Preview_Layout.insertWidget(0, _Frame)
 
-    def _PictureTaken(self, f_Result:str):
+    def _PictureTaken(self, f_Result:str, f_Preview:QImage):
         """
-        picture was taken
+        picture was saved
         :param f_Result: path to file
+        :param f_Preview: preview thumbnail, created from the frame in memory
         :return:
         """
-        if self.m_Sound_Active == True:
-            QSound.play(os.path.dirname(os.path.realpath(__file__)) + "/Sounds/Shutter.wav")
-
         _Frame = QtWidgets.QFrame()
         _Frame.setStyleSheet("background: #FFF;border: 1px solid #AAA ;margin: 5px 0px;")
         _VLayout = QtWidgets.QVBoxLayout(_Frame)
@@ -492,33 +891,17 @@ class Camera(QtWidgets.QWidget):
         _VLayout.setSpacing(2)
 
         # preview picture
-        _Picture = QImage(f_Result).scaledToWidth(self.m_Preview_Scale, Qt.FastTransformation)
         _Label = QtWidgets.QLabel()
         _Label.setStyleSheet("border: 0px;")
         _Label.setAlignment(Qt.AlignCenter)
-        _Label.setPixmap(QPixmap.fromImage(_Picture))
+        _Label.setPixmap(QPixmap.fromImage(f_Preview))
         _VLayout.addWidget(_Label)
 
         # add delete button
         _Button = QtWidgets.QPushButton()
         _Button.setText("Bild löschen")
         _Button.setStyleSheet("QPushButton { border: 1px solid#A2a2a2; background: #FF7F7F; color: #1a82b1;font-size:16pt; font-family: voestalpine; padding:10px 10px; text-align:left;}")
-
-        # if we convert our image we do it here
-        if self.m_ConvertPDF == True:
-            # load image
-            _PDF = os.path.join(os.path.dirname(os.path.abspath(f_Result)), os.path.splitext(os.path.basename(f_Result))[0] + ".pdf")
-            image_1 = Image.open(f_Result)
-            im_1 = image_1.convert('RGB')
-            im_1.save(_PDF)
-            # try to remove source
-            try:
-                os.remove(f_Result)
-            except:
-                pass
-            _Button.mouseReleaseEvent = lambda e, x=_Frame, y=_PDF: self._DeleteMediaFromPreview(x, y)
-        else:
-            _Button.mouseReleaseEvent = lambda e, x=_Frame, y=f_Result: self._DeleteMediaFromPreview(x, y)
+        _Button.mouseReleaseEvent = lambda e, x=_Frame, y=f_Result: self._DeleteMediaFromPreview(x, y)
 
         # if imageglass from QtMediaViewer is available we can open the picture
         if IMAGEGLASS_AVAILABLE:
@@ -530,14 +913,15 @@ class Camera(QtWidgets.QWidget):
 
         _VLayout.addWidget(_Button)
         self.Preview_Layout.insertWidget(0, _Frame)
+        self.m_Signal_Picture_Taken.emit(f_Result)
 
-    def _UpdateFrame(self, f_CV_Img):
-        """Updates the image_label with a new opencv image"""
-        rgb_image = cv2.cvtColor(f_CV_Img, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        convert_to_Qt_format = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        self.CameraViewer.setPixmap(QPixmap.fromImage(convert_to_Qt_format).scaled(self.CameraViewer.width(),self.CameraViewer.height(),Qt.KeepAspectRatio))
+    def _UpdateFrame(self):
+        """Updates the image_label with the latest image, already scaled by the video thread"""
+        _Image = self.m_Thread_Video.TakeFrame()
+        if _Image is None:
+            return
+        self.CameraViewer.setPixmap(QPixmap.fromImage(_Image))
+        self.m_Thread_Video.m_Preview_Size = self.CameraViewer.size()
 
     def _DeleteMediaFromPreview(self, f_Frame:QtWidgets.QFrame, f_File:str):
         """
@@ -561,8 +945,16 @@ class Camera(QtWidgets.QWidget):
         # if we record stop recording
         if self.m_Thread_Video.m_Video_Recording_Started == True:
             self._RecordVideo()
-        self.m_Signal_Kill.emit(True)
+        # the thread has no parent, it must be finished before somebody deletes us
         self.m_Thread_Video.StopCamera()
+        self.m_Thread_Video.wait()
+        self.m_Signal_Kill.emit(True)
+
+    def closeEvent(self, e):
+        """ stop our camera thread when the window is closed """
+        if self.m_Thread_Video.isRunning():
+            self._KillCamera()
+        super().closeEvent(e)
 
     def _ChangeCamera(self):
         """ kill camera """
@@ -576,8 +968,33 @@ class Camera(QtWidgets.QWidget):
         # if we record stop recording
         if self.m_Thread_Video.m_Video_Recording_Started == True:
             self._RecordVideo()
-        _File = self.m_Thread_Video.TakePicture()
-        self.m_Signal_Picture_Taken.emit(_File)
+        if self.m_Thread_Video.TakePicture() is not None and self.m_Sound_Active == True:
+            QSound.play(os.path.dirname(os.path.realpath(__file__)) + "/Sounds/Shutter.wav")
+
+    def Burst(self, f_Count: int, f_FPS: float):
+        """
+        take a series of pictures as fast as f_FPS
+        :param f_Count: amount of pictures
+        :param f_FPS: pictures per second
+        """
+        if self.m_Thread_Video.m_Video_Recording_Started == True:
+            self._RecordVideo()
+        self.m_Thread_Video.StartBurst(f_Count, f_FPS)
+
+    def Timelapse(self, f_Interval: float):
+        """
+        take a picture every f_Interval seconds until StopSeries() is called
+        :param f_Interval: seconds between two pictures
+        """
+        if self.m_Thread_Video.m_Video_Recording_Started == True:
+            self._RecordVideo()
+        self.m_Thread_Video.StartTimelapse(f_Interval)
+        self.m_Timer_Kill.stop()    # a timelapse may run longer than our kill timer
+
+    def StopSeries(self):
+        """ stop a running burst or timelapse """
+        self.m_Thread_Video.StopSeries()
+        self.m_Timer_Kill.start(self.m_Kill_Timer)
 
     def _RecordVideo(self):
         """ record a video """
@@ -592,12 +1009,29 @@ class Camera(QtWidgets.QWidget):
         # start recording
         _File = self.m_Thread_Video.RecordVideo()
         self.m_Signal_Video_Taken.emit(_File)
-        if self.pushButton_Video.text() == "Video aufnehmen":
+        self._ShowRecording(self.m_Thread_Video.m_Video_Recording_Started)
+
+    def _ShowRecording(self, f_Recording: bool):
+        """
+        show the state of the recording in our interface
+        :param f_Recording: True if a video is recorded
+        """
+        if f_Recording:
             self.pushButton_Video.setText("Aufnahme stoppen")
             self.RecordingLabel.show()
         else:
             self.pushButton_Video.setText("Video aufnehmen")
-            self.RecordingLabel.hide()
+            if hasattr(self, "RecordingLabel"):
+                self.RecordingLabel.hide()
+
+    def _VideoFailed(self, f_Error: str):
+        """
+        video could not be recorded
+        :param f_Error: error message of the recorder
+        """
+        self._ShowRecording(self.m_Thread_Video.m_Video_Recording_Started)
+        self.m_Signal_Video_Failed.emit(f_Error)
+        QtWidgets.QMessageBox.information(self, "Fehler", "Das Video konnte nicht aufgenommen werden.\n\n" + f_Error, QtWidgets.QMessageBox.Ok)
 
     def _UpdateAvailableCameras(self, f_Result:list):
         """ connected method for Video thread that returns available cameras """
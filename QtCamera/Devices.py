@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# QtCamera camera manager
+#
+# - device enumeration is done once and cached
+# - the capture backend is chosen per platform (DirectShow, V4L2, AVFoundation)
+# - a warm standby capture of the next camera makes switching instant
+# - fake devices (video file or synthetic frames) for tests and kiosk demos
+# ---------------------------------------------------------------------------
+import sys
+import time
+import threading
+
+import cv2
+import numpy as np
+
+
+""" capture device that plays a video file in a loop or creates synthetic frames """
+class FakeCapture:
+
+    def __init__(self, f_Source: str = "", f_Width: int = 1280, f_Height: int = 720, f_FPS: float = 30.0):
+        """
+        :param f_Source: video file, empty for synthetic frames
+        :param f_Width: width of synthetic frames
+        :param f_Height: height of synthetic frames
+        :param f_FPS: frames per second we deliver, 0 as fast as possible
+        """
+        self.m_Source = f_Source
+        self.m_Width = f_Width
+        self.m_Height = f_Height
+        self.m_FPS = f_FPS
+        self.m_Frame = 0
+        self.m_Next = time.perf_counter()
+        self.m_Cap = cv2.VideoCapture(f_Source) if f_Source != "" else None
+        self.m_Opened = self.m_Cap is None or self.m_Cap.isOpened()
+
+    def isOpened(self) -> bool:
+        return self.m_Opened
+
+    def set(self, f_Property: int, f_Value) -> bool:
+        if self.m_Cap is not None:
+            return False
+        if f_Property == cv2.CAP_PROP_FRAME_WIDTH:
+            self.m_Width = int(f_Value)
+        elif f_Property == cv2.CAP_PROP_FRAME_HEIGHT:
+            self.m_Height = int(f_Value)
+        elif f_Property == cv2.CAP_PROP_FPS:
+            self.m_FPS = float(f_Value)
+        return True
+
+    def get(self, f_Property: int) -> float:
+        if self.m_Cap is not None:
+            return self.m_Cap.get(f_Property)
+        return {cv2.CAP_PROP_FRAME_WIDTH: self.m_Width,
+                cv2.CAP_PROP_FRAME_HEIGHT: self.m_Height,
+                cv2.CAP_PROP_FPS: self.m_FPS}.get(f_Property, 0.0)
+
+    def read(self):
+        if not self.m_Opened:
+            return False, None
+
+        # like a real camera we deliver at our frame rate
+        if self.m_FPS > 0:
+            _Now = time.perf_counter()
+            if self.m_Next > _Now:
+                time.sleep(self.m_Next - _Now)
+            self.m_Next = max(self.m_Next, _Now) + 1.0 / self.m_FPS
+        self.m_Frame += 1
+
+        if self.m_Cap is not None:
+            _Ret, _Frame = self.m_Cap.read()
+            if not _Ret:    # start again
+                self.m_Cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                _Ret, _Frame = self.m_Cap.read()
+            return _Ret, _Frame
+
+        # moving gradient with the frame number
+        _Frame = np.empty((self.m_Height, self.m_Width, 3), np.uint8)
+        _Frame[:] = ((np.arange(self.m_Width) + self.m_Frame * 4) % 256).astype(np.uint8)[None, :, None]
+        cv2.putText(_Frame, str(self.m_Frame), (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
+        return True, _Frame
+
+    def grab(self) -> bool:
+        return self.read()[0]
+
+    def release(self):
+        if self.m_Cap is not None:
+            self.m_Cap.release()
+        self.m_Opened = False
+
+
+""" opens, caches and releases camera captures """
+class CameraManager:
+
+    # config variables
+    m_Width = 1280                          # requested resolution
+    m_Height = 720
+    m_Standby = False                       # keep the next camera open for instant switching
+
+    # class vars
+    m_Devices = None                        # cached list of device indexes
+    m_Fakes = []                            # sources of our fake devices, they follow the real ones
+    m_Lock = threading.RLock()
+    m_Standby_Index = None                  # index of our warm standby capture
+    m_Standby_Cap = None
+    m_Standby_Thread = None
+
+    @staticmethod
+    def Backend() -> int:
+        """ capture backend of our platform """
+        if sys.platform.startswith("win"):
+            return cv2.CAP_DSHOW
+        if sys.platform.startswith("linux"):
+            return cv2.CAP_V4L2
+        if sys.platform == "darwin":
+            return cv2.CAP_AVFOUNDATION
+        return cv2.CAP_ANY
+
+    @classmethod
+    def Devices(cls, f_Refresh: bool = False) -> list:
+        """
+        all available cameras, enumerated only once
+        :param f_Refresh: enumerate again, e.g. after a camera was plugged in
+        :return: list with all available camera indexes
+        """
+        with cls.m_Lock:
+            if cls.m_Devices is None or f_Refresh:
+                from PyQt5.QtMultimedia import QCamera
+                cls.m_Devices = list(range(len(QCamera.availableDevices())))
+            return cls.m_Devices + [len(cls.m_Devices) + i for i in range(len(cls.m_Fakes))]
+
+    @classmethod
+    def AddFakeDevice(cls, f_Source: str = "") -> int:
+        """
+        add a fake camera
+        :param f_Source: video file, empty for synthetic frames
+        :return: index of the fake camera
+        """
+        with cls.m_Lock:
+            cls.m_Fakes.append(f_Source)
+            return cls.Devices()[-1]
+
+    @classmethod
+    def Open(cls, f_Index: int):
+        """
+        open a camera, our warm standby is used if it is the right one
+        :param f_Index: camera index
+        :return: capture object (cv2.VideoCapture or FakeCapture)
+        """
+        with cls.m_Lock:
+            cls._WaitStandby()
+            if cls.m_Standby_Index == f_Index and cls.m_Standby_Cap is not None:
+                _Cap = cls.m_Standby_Cap
+                cls.m_Standby_Index, cls.m_Standby_Cap = None, None
+            else:
+                _Cap = cls._Create(f_Index)
+            cls._PrepareStandby(f_Index)
+        return _Cap
+
+    @classmethod
+    def Switch(cls, f_Cap, f_Index: int):
+        """
+        release a capture and open another camera
+        :param f_Cap: capture in use, may be None
+        :param f_Index: camera index to open
+        :return: new capture
+        """
+        cls.Release(f_Cap)
+        return cls.Open(f_Index)
+
+    @staticmethod
+    def Release(f_Cap):
+        """ release a capture """
+        if f_Cap is not None:
+            f_Cap.release()
+
+    @classmethod
+    def Close(cls):
+        """ release our warm standby """
+        with cls.m_Lock:
+            cls._WaitStandby()
+            cls.Release(cls.m_Standby_Cap)
+            cls.m_Standby_Index, cls.m_Standby_Cap = None, None
+
+    @classmethod
+    def _Create(cls, f_Index: int):
+        """ open a capture with our settings """
+        _Real = cls.m_Devices if cls.m_Devices is not None else []
+        if f_Index >= len(_Real) and f_Index - len(_Real) < len(cls.m_Fakes):
+            _Cap = FakeCapture(cls.m_Fakes[f_Index - len(_Real)])
+        else:
+            _Cap = cv2.VideoCapture(f_Index, cls.Backend())
+        _Cap.set(cv2.CAP_PROP_FRAME_WIDTH, cls.m_Width)
+        _Cap.set(cv2.CAP_PROP_FRAME_HEIGHT, cls.m_Height)
+        _Cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return _Cap
+
+    @classmethod
+    def _PrepareStandby(cls, f_Current: int):
+        """ open the camera that follows f_Current in the background, lock must be held """
+        from .Service import CaptureService
+        _Devices = cls.Devices()
+        if not cls.m_Standby or len(_Devices) < 2:
+            return
+
+        # the next camera that no capture service holds already
+        _Used = set(CaptureService.m_Services) | {f_Current}
+        _Start = _Devices.index(f_Current) + 1 if f_Current in _Devices else 0
+        _Next = next((_Index for _Index in _Devices[_Start:] + _Devices[:_Start] if _Index not in _Used), None)
+        if _Next is None:
+            cls.Release(cls.m_Standby_Cap)
+            cls.m_Standby_Index, cls.m_Standby_Cap = None, None
+            return
+        if cls.m_Standby_Index == _Next:
+            return
+        cls.Release(cls.m_Standby_Cap)
+        cls.m_Standby_Index, cls.m_Standby_Cap = _Next, None
+
+        def _Open():
+            _Cap = cls._Create(_Next)
+            with cls.m_Lock:
+                if cls.m_Standby_Index == _Next and cls.m_Standby_Cap is None:
+                    cls.m_Standby_Cap = _Cap
+                    return
+            cls.Release(_Cap)
+        cls.m_Standby_Thread = threading.Thread(target=_Open, daemon=True)
+        cls.m_Standby_Thread.start()
+
+    @classmethod
+    def _WaitStandby(cls):
+        """ wait until a standby capture is opened, lock must be held """
+        _Thread = cls.m_Standby_Thread
+        if _Thread is not None and _Thread.is_alive():
+            cls.m_Lock.release()
+            try:
+                _Thread.join()
+            finally:
+                cls.m_Lock.acquire()
+        cls.m_Standby_Thread = None
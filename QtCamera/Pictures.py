@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# QtCamera picture writer
+#
+# Taking a picture only hands the frame of the camera over to a small pool
+# of workers. Rotation, jpeg encoding, pdf conversion and the preview
+# thumbnail are done there - the preview comes from the frame in memory,
+# the file is never read back.
+# Only m_Queue_Size pictures may wait for the workers, further ones are
+# dropped and counted. Burst and timelapse series report the sustained
+# rate of written pictures when they are finished.
+# ---------------------------------------------------------------------------
+import os
+import cv2
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QImage
+
+# Qt >= 5.14 takes opencv frames without a color conversion
+FORMAT_BGR888 = getattr(QImage, "Format_BGR888", None)
+
+
+class PictureWriter(QObject):
+    m_Signal_Saved = pyqtSignal(str, QImage)    # file and preview thumbnail of a saved picture
+    m_Signal_Series = pyqtSignal(dict)          # statistics of a finished series, see Statistics()
+
+    # config variables
+    m_Workers = 2                               # pictures encoded at the same time
+    m_Quality = 95                              # jpeg quality (0 - 100)
+    m_Rotate = 0                                # rotate pictures (90, 180, 270)
+    m_ConvertPDF = False                        # save a pdf instead of the jpeg
+    m_Preview_Width = 350                       # width of the preview thumbnail
+    m_Queue_Size = 16                           # pictures waiting for the workers, more are dropped
+
+    m_Rotations = {90: cv2.ROTATE_90_CLOCKWISE, 180: cv2.ROTATE_180, 270: cv2.ROTATE_90_COUNTERCLOCKWISE}
+
+    m_Writers = 0                               # writers created in this process, part of the session prefix
+    m_Writers_Lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        QObject.__init__(self)
+        self.m_Pool = ThreadPoolExecutor(max_workers=self.m_Workers)
+        self.m_Lock = threading.Lock()
+        self.m_Pending = 0
+        self.m_Sequence = 0
+        # session prefix, sequence numbers are added - writers started in the same second get their own one
+        with PictureWriter.m_Writers_Lock:
+            PictureWriter.m_Writers += 1
+            self.m_Prefix = "{}-{}".format(time.strftime("%Y%m%d-%H%M%S"), PictureWriter.m_Writers)
+
+        # series
+        self.m_Series = False
+        self.m_Series_Closed = False
+        self.m_Series_Start = 0.0
+        self.m_Series_Last = 0.0
+        self.m_Written = 0
+        self.m_Dropped = 0
+
+    def NextFilename(self, f_Folder: str) -> str:
+        """
+        collision free name for the next picture: session start, writer and a sequence number
+        :param f_Folder: folder of the picture
+        :return: path without extension
+        """
+        with self.m_Lock:
+            while True:
+                self.m_Sequence += 1
+                _Path = os.path.join(f_Folder, "{}-{:05}".format(self.m_Prefix, self.m_Sequence))
+                if not os.path.exists(_Path + ".jpg") and not os.path.exists(_Path + ".pdf"):
+                    return _Path
+
+    def Save(self, f_CV_Img, f_Filename: str) -> str:
+        """
+        save a frame in the background
+        :param f_CV_Img: BGR frame, must not be changed afterwards
+        :param f_Filename: path of the jpeg, the extension is set by us
+        :return: path of the file that will be written (.pdf if converted), None if dropped
+        """
+        f_Filename = os.path.splitext(f_Filename)[0] + (".pdf" if self.m_ConvertPDF else ".jpg")
+        with self.m_Lock:
+            if self.m_Pending >= self.m_Queue_Size:
+                self.m_Dropped += 1
+                return None
+            self.m_Pending += 1
+        self.m_Pool.submit(self._Save, f_CV_Img, f_Filename, self.m_Rotate, self.m_Quality, self.m_Preview_Width)
+        return f_Filename
+
+    def StartSeries(self):
+        """ start counting for a burst or timelapse """
+        with self.m_Lock:
+            self.m_Series = True
+            self.m_Series_Closed = False
+            self.m_Series_Start = time.perf_counter()
+            self.m_Series_Last = self.m_Series_Start
+            self.m_Written = 0
+            self.m_Dropped = 0
+
+    def EndSeries(self):
+        """ no more pictures for the series, m_Signal_Series is emitted when the last one is written """
+        with self.m_Lock:
+            self.m_Series_Closed = True
+            _Done = self.m_Series and self.m_Pending == 0
+            if _Done:
+                self.m_Series = False
+        if _Done:
+            self.m_Signal_Series.emit(self.Statistics())
+
+    def Statistics(self) -> dict:
+        """
+        counters of the current or last series
+        :return: dict with written and dropped pictures and the sustained rate of written pictures
+        """
+        _Seconds = self.m_Series_Last - self.m_Series_Start
+        return {"written": self.m_Written,
+                "dropped": self.m_Dropped,
+                "fps": self.m_Written / _Seconds if _Seconds > 0 else 0.0}
+
+    def _Save(self, f_CV_Img, f_Filename: str, f_Rotate: int, f_Quality: int, f_Preview_Width: int):
+        """ worker: rotate, encode and create the preview """
+        try:
+            if f_Rotate in self.m_Rotations:
+                f_CV_Img = cv2.rotate(f_CV_Img, self.m_Rotations[f_Rotate])
+
+            if f_Filename.lower().endswith(".pdf"):
+                from PIL import Image
+                Image.fromarray(cv2.cvtColor(f_CV_Img, cv2.COLOR_BGR2RGB)).save(f_Filename, quality=f_Quality)
+            else:
+                cv2.imwrite(f_Filename, f_CV_Img, [cv2.IMWRITE_JPEG_QUALITY, f_Quality])
+
+            h, w = f_CV_Img.shape[:2]
+            if 0 < f_Preview_Width < w:
+                f_CV_Img = cv2.resize(f_CV_Img, (f_Preview_Width, max(1, int(h * f_Preview_Width / w))), interpolation=cv2.INTER_AREA)
+                h, w = f_CV_Img.shape[:2]
+            if FORMAT_BGR888 is not None:
+                _Preview = QImage(f_CV_Img.data, w, h, f_CV_Img.strides[0], FORMAT_BGR888).copy()
+            else:
+                _Preview = QImage(f_CV_Img.data, w, h, f_CV_Img.strides[0], QImage.Format_RGB888).rgbSwapped()
+            self.m_Signal_Saved.emit(f_Filename, _Preview)
+            with self.m_Lock:
+                self.m_Written += 1
+                self.m_Series_Last = time.perf_counter()
+        except Exception as e:
+            print(e)
+        finally:
+            with self.m_Lock:
+                self.m_Pending -= 1
+                _Done = self.m_Series and self.m_Series_Closed and self.m_Pending == 0
+                if _Done:
+                    self.m_Series = False
+            if _Done:
+                self.m_Signal_Series.emit(self.Statistics())
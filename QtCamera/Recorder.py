@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# QtCamera video recorder
+#
+# Encodes the frames of the camera into the final file while we record.
+# Every frame and audio chunk carries its capture time, so audio and video
+# stay in sync no matter how many frames per second the camera delivers.
+#
+# Backends:
+# - PyAV (pip install av): video and audio are muxed in process
+# - ffmpeg (ffmpeg.exe next to this file or in PATH): frames are piped to
+#   ffmpeg with constant frame rate, the audio chunks to a second ffmpeg
+#   that encodes them while we record. When the recording stops both
+#   streams are only copied into the final file.
+#
+# Stop() never blocks, the file is finished in the recorder thread and
+# m_Signal_Finished is emitted afterwards. If the encoder fails we emit
+# m_Signal_Failed instead, further frames and audio chunks are thrown away
+# and no temporary or half written file is left behind.
+# ---------------------------------------------------------------------------
+import os
+import time
+import queue
+import shutil
+import threading
+import subprocess
+from fractions import Fraction
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+
+
+class MediaRecorder(QThread):
+    m_Signal_Finished = pyqtSignal(str)     # returns the filename when the file is complete
+    m_Signal_Failed = pyqtSignal(str)       # error message if the file could not be written, m_Signal_Finished is not emitted
+
+    # config variables
+    m_FPS = 30                              # nominal frame rate, constant frame rate of the ffmpeg backend
+    m_Queue_Size = 60                       # frames waiting for the encoder, newer ones are dropped
+    m_Audio_Queue_Size = 256                # audio chunks waiting for the encoder (about 6 s), newer ones are dropped
+    m_Channels = 2                          # audio format of the AudioThread
+    m_Rate = 44100
+
+    # counters
+    m_Frames_Written = 0
+    m_Frames_Dropped = 0
+    m_Frames_Pending = 0                    # frames in our queue, audio chunks are not counted
+    m_Chunks_Dropped = 0
+    m_Chunks_Pending = 0                    # audio chunks in our queue
+    m_Failed = False                        # the encoder failed, nothing is queued anymore
+
+    def __init__(self, f_Filename: str, f_Width: int, f_Height: int):
+        """
+        prepare a recording, call start() afterwards
+        :param f_Filename: final video file (.mp4)
+        :param f_Width: width of the camera frames
+        :param f_Height: height of the camera frames
+        """
+        QThread.__init__(self)
+        self.m_Filename = f_Filename
+        self.m_Width = f_Width
+        self.m_Height = f_Height
+        self.m_Backend = self.Backend()
+        if self.m_Backend == "":
+            raise RuntimeError("no video encoder available, install PyAV (pip install av) or ffmpeg")
+
+        self.m_Queue = queue.Queue()
+        self.m_Lock = threading.Lock()
+        self.m_Start = time.perf_counter()   # time 0 of our recording
+
+    @staticmethod
+    def FFmpeg() -> str:
+        """ path to the ffmpeg executable or "" """
+        _Local = os.path.join(os.path.dirname(os.path.realpath(__file__)), "ffmpeg.exe")
+        if os.path.isfile(_Local):
+            return _Local
+        return shutil.which("ffmpeg") or ""
+
+    @classmethod
+    def Backend(cls) -> str:
+        """ name of the backend we use: "pyav", "ffmpeg" or "" if none is available """
+        if PYAV_AVAILABLE:
+            return "pyav"
+        if cls.FFmpeg() != "":
+            return "ffmpeg"
+        return ""
+
+    def PushFrame(self, f_CV_Img, f_Time: float = 0.0):
+        """
+        add a frame, never blocks the capture loop
+        :param f_CV_Img: BGR frame, must not be changed afterwards
+        :param f_Time: capture time (time.perf_counter()), 0 for now
+        """
+        with self.m_Lock:
+            if self.m_Failed:
+                return
+            if self.m_Frames_Pending >= self.m_Queue_Size:
+                self.m_Frames_Dropped += 1
+                return
+            self.m_Frames_Pending += 1
+        self.m_Queue.put(("video", f_CV_Img, (f_Time or time.perf_counter()) - self.m_Start))
+
+    def PushAudio(self, f_Data: bytes, f_Time: float = 0.0):
+        """
+        add an audio chunk (16 bit interleaved)
+        :param f_Data: raw samples
+        :param f_Time: time the chunk was complete (time.perf_counter()), 0 for now
+        """
+        with self.m_Lock:
+            if self.m_Failed:
+                return
+            if self.m_Chunks_Pending >= self.m_Audio_Queue_Size:
+                self.m_Chunks_Dropped += 1
+                return
+            self.m_Chunks_Pending += 1
+        self.m_Queue.put(("audio", f_Data, (f_Time or time.perf_counter()) - self.m_Start))
+
+    def Stop(self):
+        """ finish the recording without blocking """
+        self.m_Queue.put(("stop", None, 0.0))
+
+    def _Get(self) -> tuple:
+        """ next item of our queue: (kind, data, time) """
+        _Item = self.m_Queue.get()
+        with self.m_Lock:
+            if _Item[0] == "video":
+                self.m_Frames_Pending -= 1
+            elif _Item[0] == "audio":
+                self.m_Chunks_Pending -= 1
+        return _Item
+
+    def run(self):
+        try:
+            if self.m_Backend == "pyav":
+                self._Run_PyAV()
+            else:
+                self._Run_FFmpeg()
+        except Exception as e:
+            self._Fail(e)
+            return
+        self.m_Signal_Finished.emit(self.m_Filename)
+
+    def _Fail(self, f_Error: Exception):
+        """
+        the encoder failed: stop queueing, throw away what is queued and the half written file
+        :param f_Error: exception of the backend
+        """
+        with self.m_Lock:
+            self.m_Failed = True
+        while True:
+            try:
+                self.m_Queue.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            os.remove(self.m_Filename)
+        except OSError:
+            pass
+        self.m_Signal_Failed.emit("{}: {}".format(type(f_Error).__name__, f_Error))
+
+    def _Run_PyAV(self):
+        """ encode video and audio into our container while we record """
+        _Container = av.open(self.m_Filename, "w")
+        try:
+            _Video = _Container.add_stream("h264", rate=self.m_FPS)
+            _Video.width = self.m_Width
+            _Video.height = self.m_Height
+            _Video.pix_fmt = "yuv420p"
+            _Video.codec_context.time_base = Fraction(1, 1000)
+            _Audio = _Container.add_stream("aac", rate=self.m_Rate, layout="stereo" if self.m_Channels == 2 else "mono")
+
+            _Last_Pts = -1
+            _Samples = None     # samples written, starts with the offset of the first chunk
+            while True:
+                _Kind, _Data, _Time = self._Get()
+                if _Kind == "stop":
+                    break
+
+                if _Kind == "video":
+                    # timestamps in ms, two frames in the same ms can't be stored
+                    _Pts = int(_Time * 1000)
+                    if _Pts <= _Last_Pts:
+                        continue
+                    _Last_Pts = _Pts
+                    _Frame = av.VideoFrame.from_ndarray(_Data, format="bgr24")
+                    _Frame.pts = _Pts
+                    _Frame.time_base = Fraction(1, 1000)
+                    for _Packet in _Video.encode(_Frame):
+                        _Container.mux(_Packet)
+                    self.m_Frames_Written += 1
+                    continue
+
+                _Array = np.frombuffer(_Data, np.int16).reshape(1, -1)
+                if _Samples is None:
+                    _Samples = max(0, int(_Time * self.m_Rate) - _Array.shape[1] // self.m_Channels)
+                _Frame = av.AudioFrame.from_ndarray(_Array, format="s16", layout=_Audio.layout.name)
+                _Frame.sample_rate = self.m_Rate
+                _Frame.pts = _Samples
+                _Frame.time_base = Fraction(1, self.m_Rate)
+                _Samples += _Array.shape[1] // self.m_Channels
+                for _Packet in _Audio.encode(_Frame):
+                    _Container.mux(_Packet)
+
+            # flush encoders
+            for _Packet in _Video.encode():
+                _Container.mux(_Packet)
+            for _Packet in _Audio.encode():
+                _Container.mux(_Packet)
+        finally:
+            _Container.close()
+
+    def _Run_FFmpeg(self):
+        """ pipe the video and the audio to ffmpeg while we record, both streams are copied together at the end """
+        _Video_File = os.path.splitext(self.m_Filename)[0] + ".video.mp4"
+        _Audio_File = os.path.splitext(self.m_Filename)[0] + ".audio.m4a"
+        _Process = None     # video encoder
+        _Audio = None       # audio encoder, started with the first chunk
+        _Audio_Offset = 0.0
+        try:
+            _Process = subprocess.Popen([self.FFmpeg(), "-y", "-loglevel", "error",
+                                         "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", "{}x{}".format(self.m_Width, self.m_Height),
+                                         "-r", str(self.m_FPS), "-i", "-",
+                                         "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", _Video_File],
+                                        stdin=subprocess.PIPE)
+
+            # constant frame rate: the last frame is repeated or frames are skipped to match their capture time
+            _Written = 0
+            while True:
+                _Kind, _Data, _Time = self._Get()
+                if _Kind == "stop":
+                    break
+
+                if _Kind == "video":
+                    _Bytes = _Data.tobytes()
+                    while _Written <= int(_Time * self.m_FPS):
+                        _Process.stdin.write(_Bytes)
+                        _Written += 1
+                    self.m_Frames_Written += 1
+                    continue
+
+                if _Audio is None:
+                    _Audio_Offset = max(0.0, _Time - len(_Data) / (2 * self.m_Channels * self.m_Rate))
+                    _Audio = subprocess.Popen([self.FFmpeg(), "-y", "-loglevel", "error",
+                                               "-f", "s16le", "-ar", str(self.m_Rate), "-ac", str(self.m_Channels), "-i", "-",
+                                               "-c:a", "aac", _Audio_File],
+                                              stdin=subprocess.PIPE)
+                _Audio.stdin.write(_Data)
+
+            _Process.stdin.close()
+            if _Process.wait() != 0:
+                raise RuntimeError("ffmpeg could not encode the video")
+            if _Audio is None:
+                os.replace(_Video_File, self.m_Filename)
+                return
+            _Audio.stdin.close()
+            if _Audio.wait() != 0:
+                raise RuntimeError("ffmpeg could not encode the audio")
+
+            # both streams are encoded already, they are only copied
+            if subprocess.call([self.FFmpeg(), "-y", "-loglevel", "error", "-i", _Video_File, "-itsoffset", "{:.3f}".format(_Audio_Offset), "-i", _Audio_File,
+                                "-map", "0:v", "-map", "1:a", "-c", "copy", "-shortest", self.m_Filename]) != 0:
+                raise RuntimeError("ffmpeg could not write {}".format(self.m_Filename))
+        finally:
+            self._Close(_Process)
+            self._Close(_Audio)
+            for _File in (_Video_File, _Audio_File):
+                try:
+                    os.remove(_File)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _Close(f_Process: subprocess.Popen):
+        """
+        make sure an ffmpeg process is gone, it is killed if it still runs after an error
+        :param f_Process: process or None
+        """
+        if f_Process is None:
+            return
+        if f_Process.poll() is None:
+            f_Process.kill()
+        try:
+            f_Process.stdin.close()
+        except OSError:
+            pass
+        f_Process.wait()
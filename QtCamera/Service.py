@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# QtCamera capture service
+#
+# One service per camera reads the device, any number of consumers (e.g. a
+# preview and a scanner widget) subscribe to it. The device is opened with
+# the first subscription and released with the last one, so it is only read
+# once no matter how many widgets are shown.
+# Every subscription is its own channel with its own frame rate and keeps
+# only the latest frame - a slow consumer never slows down the others.
+# ---------------------------------------------------------------------------
+import time
+import threading
+
+from PyQt5.QtCore import QThread
+
+from .Devices import CameraManager
+
+
+""" channel of one consumer: rate limited, latest frame wins """
+class Subscription:
+
+    def __init__(self, f_Index: int, f_FPS: float):
+        """
+        :param f_Index: camera index
+        :param f_FPS: max frames per second for this consumer, 0 for all frames
+        """
+        self.m_Index = f_Index
+        self.m_FPS = f_FPS
+        self.m_Condition = threading.Condition()
+        self.m_Frame = None             # (frame, time.time(), time.perf_counter()) not read yet
+        self.m_Next = 0.0               # time.perf_counter() of the next frame we take
+
+        # counters
+        self.m_Skipped = 0              # frames skipped by our frame rate
+        self.m_Missed = 0               # frames replaced before the consumer read them
+
+    def Put(self, f_CV_Img, f_Time: float, f_Clock: float):
+        """ called by the service for every frame of the camera """
+        if self.m_FPS > 0:
+            if f_Clock < self.m_Next:
+                self.m_Skipped += 1
+                return
+            self.m_Next = max(self.m_Next, f_Clock - 1.0 / self.m_FPS) + 1.0 / self.m_FPS
+
+        with self.m_Condition:
+            if self.m_Frame is not None:
+                self.m_Missed += 1
+            self.m_Frame = (f_CV_Img, f_Time, f_Clock)
+            self.m_Condition.notify()
+
+    def Wake(self):
+        """ let a waiting Read() return without a frame """
+        with self.m_Condition:
+            self.m_Condition.notify_all()
+
+    def Read(self, f_Timeout: float = 0.5) -> tuple:
+        """
+        wait for the next frame
+        :param f_Timeout: max seconds to wait
+        :return: (BGR frame, time.time(), time.perf_counter()) of the capture, frame is None on timeout
+        """
+        with self.m_Condition:
+            if self.m_Frame is None:
+                self.m_Condition.wait(f_Timeout)
+            _Frame, self.m_Frame = self.m_Frame, None
+        return _Frame if _Frame is not None else (None, 0.0, 0.0)
+
+
+""" QThread that reads one camera and feeds all subscriptions """
+class CaptureService(QThread):
+
+    m_Backoff_Min = 0.005                   # wait time in s if the camera is not ready, doubles up to m_Backoff_Max
+    m_Backoff_Max = 0.5
+
+    # class vars
+    m_Services = {}                         # camera index -> running service
+    m_Lock = threading.Lock()
+
+    def __init__(self, f_Index: int):
+        QThread.__init__(self)
+        self.m_Index = f_Index
+        self.m_Subscriptions = []
+        self.m_Frames = 0                   # frames read from the camera
+
+    @classmethod
+    def Subscribe(cls, f_Index: int, f_FPS: float = 0) -> Subscription:
+        """
+        get frames of a camera, the camera is opened with the first subscription
+        :param f_Index: camera index
+        :param f_FPS: max frames per second, 0 for all frames
+        :return: subscription, give it back with Unsubscribe()
+        """
+        _Subscription = Subscription(f_Index, f_FPS)
+        with cls.m_Lock:
+            _Service = cls.m_Services.get(f_Index)
+            if _Service is None:
+                _Service = cls.m_Services[f_Index] = CaptureService(f_Index)
+                _Service.start()
+            _Service.m_Subscriptions = _Service.m_Subscriptions + [_Subscription]
+        return _Subscription
+
+    @classmethod
+    def Unsubscribe(cls, f_Subscription: Subscription, f_Close: bool = True):
+        """
+        stop getting frames, the camera is released with the last subscription
+        :param f_Subscription: subscription of Subscribe()
+        :param f_Close: release the warm standby of the CameraManager with the last subscription,
+                        False if another camera is subscribed right away
+        """
+        with cls.m_Lock:
+            _Service = cls.m_Services.get(f_Subscription.m_Index)
+            if _Service is None or f_Subscription not in _Service.m_Subscriptions:
+                return
+            _Service.m_Subscriptions = [s for s in _Service.m_Subscriptions if s is not f_Subscription]
+            if len(_Service.m_Subscriptions) > 0:
+                return
+            del cls.m_Services[f_Subscription.m_Index]
+            _Last = len(cls.m_Services) == 0
+
+        _Service.requestInterruption()
+        _Service.wait()
+        if _Last and f_Close:
+            CameraManager.Close()
+
+    @classmethod
+    def Subscribers(cls, f_Index: int) -> int:
+        """ amount of subscriptions of a camera """
+        with cls.m_Lock:
+            _Service = cls.m_Services.get(f_Index)
+            return len(_Service.m_Subscriptions) if _Service is not None else 0
+
+    def run(self):
+        _Cap = CameraManager.Open(self.m_Index)
+        _Backoff = self.m_Backoff_Min
+        _Next = time.perf_counter()
+        try:
+            while not self.isInterruptionRequested():
+                # we don't need more frames than our fastest subscriber
+                _Rates = [s.m_FPS for s in self.m_Subscriptions]
+                _FPS = 0 if len(_Rates) == 0 or 0 in _Rates else max(_Rates)
+                if _FPS > 0:
+                    _Now = time.perf_counter()
+                    if _Next > _Now:
+                        time.sleep(_Next - _Now)
+                    _Next = max(_Next, _Now - 1.0 / _FPS) + 1.0 / _FPS
+
+                ret, _CV_Img = _Cap.read()
+                if ret != True:    # wait a little longer every time the cam is not ready
+                    time.sleep(_Backoff)
+                    _Backoff = min(_Backoff * 2, self.m_Backoff_Max)
+                    continue
+                _Backoff = self.m_Backoff_Min
+                self.m_Frames += 1
+
+                # every subscriber gets the same array, nobody may change it
+                _Time, _Clock = time.time(), time.perf_counter()
+                for _Subscription in self.m_Subscriptions:
+                    _Subscription.Put(_CV_Img, _Time, _Clock)
+        finally:
+            CameraManager.Release(_Cap)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# QtMediaWidget persistent thumbnail cache
+#
+# All previews are stored in one single SQLite file. An entry is addressed by
+# path, mtime, size and preview height of the source file - if one of them
+# changes the old entry is never hit again and gets evicted some day.
+# The cache has a size cap and evicts the least recently used entries.
+# ---------------------------------------------------------------------------
+import os
+import time
+import hashlib
+import sqlite3
+import tempfile
+import threading
+
+
+class ThumbnailCache:
+
+    m_Path: str = ""                        # path to our sqlite file
+    m_MaxBytes: int = 512 * 1024 * 1024     # size cap for all stored previews
+    m_Bytes: int = 0                        # current size of all stored previews
+
+    def __init__(self, f_Path: str = "", f_MaxBytes: int = 512 * 1024 * 1024):
+        """
+        open (or create) a thumbnail cache
+        :param f_Path: path to the cache file, empty for the default location in the temp folder
+        :param f_MaxBytes: size cap of the cache in bytes
+        """
+        if f_Path == "":
+            f_Path = os.path.join(tempfile.gettempdir(), "QtMediaViewer", "Thumbnails.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(f_Path)), exist_ok=True)
+
+        self.m_Path = f_Path
+        self.m_MaxBytes = f_MaxBytes
+
+        # one connection shared by all preview threads
+        self.m_Lock = threading.Lock()
+        self.m_Connection = sqlite3.connect(self.m_Path, check_same_thread=False, isolation_level=None)
+        self.m_Connection.execute("PRAGMA journal_mode=WAL")
+        self.m_Connection.execute("PRAGMA synchronous=NORMAL")
+        self.m_Connection.execute("CREATE TABLE IF NOT EXISTS thumbnails ("
+                                  "key TEXT PRIMARY KEY, "
+                                  "path TEXT, "
+                                  "mtime INTEGER, "
+                                  "size INTEGER, "
+                                  "height INTEGER, "
+                                  "bytes INTEGER, "
+                                  "accessed REAL, "
+                                  "data BLOB)")
+        self.m_Connection.execute("CREATE INDEX IF NOT EXISTS thumbnails_accessed ON thumbnails (accessed)")
+        self.m_Bytes = self.m_Connection.execute("SELECT COALESCE(SUM(bytes), 0) FROM thumbnails").fetchone()[0]
+
+    @staticmethod
+    def Key(f_File: str, f_Height: int, f_Stat: os.stat_result = None) -> str:
+        """
+        create the content address of a preview
+        :param f_File: path to the source file
+        :param f_Height: preview height
+        :param f_Stat: stat result of the source file if already known
+        :return: key for the cache or "" if the file is not accessible
+        """
+        try:
+            if f_Stat is None:
+                f_Stat = os.stat(f_File)
+        except OSError:
+            return ""
+        _Raw = "{}|{}|{}|{}".format(os.path.normcase(os.path.abspath(f_File)), f_Stat.st_mtime_ns, f_Stat.st_size, f_Height)
+        return hashlib.sha1(_Raw.encode("utf-8", "surrogateescape")).hexdigest()
+
+    def Get(self, f_Key: str):
+        """
+        get the stored preview of a key
+        :param f_Key: key created with Key()
+        :return: encoded preview as bytes or None
+        """
+        if f_Key == "":
+            return None
+        with self.m_Lock:
+            _Row = self.m_Connection.execute("SELECT data FROM thumbnails WHERE key=?", (f_Key,)).fetchone()
+            if _Row is None:
+                return None
+            self.m_Connection.execute("UPDATE thumbnails SET accessed=? WHERE key=?", (time.time(), f_Key))
+        return bytes(_Row[0])
+
+    def Has(self, f_Key: str) -> bool:
+        """
+        check if a preview is stored without touching its access time
+        :param f_Key: key created with Key()
+        :return: True if the key is stored
+        """
+        if f_Key == "":
+            return False
+        with self.m_Lock:
+            return self.m_Connection.execute("SELECT 1 FROM thumbnails WHERE key=?", (f_Key,)).fetchone() is not None
+
+    def Put(self, f_Key: str, f_File: str, f_Height: int, f_Data: bytes):
+        """
+        store an encoded preview
+        :param f_Key: key created with Key()
+        :param f_File: path to the source file
+        :param f_Height: preview height
+        :param f_Data: encoded preview
+        """
+        if f_Key == "" or not f_Data:
+            return
+        try:
+            _Stat = os.stat(f_File)
+        except OSError:
+            return
+
+        with self.m_Lock:
+            _Old = self.m_Connection.execute("SELECT bytes FROM thumbnails WHERE key=?", (f_Key,)).fetchone()
+            self.m_Connection.execute("INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                      (f_Key, f_File, _Stat.st_mtime_ns, _Stat.st_size, f_Height, len(f_Data), time.time(), sqlite3.Binary(f_Data)))
+            self.m_Bytes += len(f_Data) - (_Old[0] if _Old is not None else 0)
+
+            if self.m_Bytes > self.m_MaxBytes:
+                self._Evict(int(self.m_MaxBytes * 0.9))
+
+    def Clear(self):
+        """ remove all stored previews """
+        with self.m_Lock:
+            self.m_Connection.execute("DELETE FROM thumbnails")
+            self.m_Connection.execute("VACUUM")
+            self.m_Bytes = 0
+
+    def Close(self):
+        """ close the cache file """
+        with self.m_Lock:
+            self.m_Connection.close()
+
+    def _Evict(self, f_Target: int):
+        """
+        remove least recently used previews until we are below f_Target bytes
+        lock must be held by the caller
+        :param f_Target: size in bytes
+        """
+        while self.m_Bytes > f_Target:
+            _Rows = self.m_Connection.execute("SELECT key, bytes FROM thumbnails ORDER BY accessed LIMIT 256").fetchall()
+            if len(_Rows) == 0:
+                self.m_Bytes = 0
+                return
+            for _Key, _Bytes in _Rows:
+                self.m_Connection.execute("DELETE FROM thumbnails WHERE key=?", (_Key,))
+                self.m_Bytes -= _Bytes
+                if self.m_Bytes <= f_Target:
+                    break
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# QtMediaWidget persistent file index
+#
+# Stores all folders of a media root with their mtime and subfolders and
+# all media files with size, mtime and media type in one SQLite file.
+# A folder only gets listed again if its mtime changed - adding, removing
+# or renaming an entry changes the mtime of the folder that contains it.
+# ---------------------------------------------------------------------------
+import os
+import hashlib
+import sqlite3
+import tempfile
+import threading
+
+
+class FileIndex:
+
+    m_Root: str = ""        # media folder
+    m_Path: str = ""        # path to our sqlite file
+
+    def __init__(self, f_Root: str, f_Path: str = ""):
+        """
+        open (or create) the index of a media folder
+        :param f_Root: media folder
+        :param f_Path: path to the index file, empty for the default location in the temp folder
+        """
+        if f_Path == "":
+            _Hash = hashlib.sha1(os.path.normcase(os.path.abspath(f_Root)).encode("utf-8", "surrogateescape")).hexdigest()
+            f_Path = os.path.join(tempfile.gettempdir(), "QtMediaViewer", "Index-{}.sqlite".format(_Hash))
+        os.makedirs(os.path.dirname(os.path.abspath(f_Path)), exist_ok=True)
+
+        self.m_Root = f_Root
+        self.m_Path = f_Path
+
+        self.m_Lock = threading.Lock()
+        self.m_Connection = sqlite3.connect(self.m_Path, check_same_thread=False)
+        self.m_Connection.execute("PRAGMA journal_mode=WAL")
+        self.m_Connection.execute("PRAGMA synchronous=NORMAL")
+        self.m_Connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.m_Connection.execute("CREATE TABLE IF NOT EXISTS folders (path TEXT PRIMARY KEY, mtime INTEGER, subfolders TEXT)")
+        self.m_Connection.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, folder TEXT, size INTEGER, mtime INTEGER, type TEXT)")
+        self.m_Connection.execute("CREATE INDEX IF NOT EXISTS files_folder ON files (folder)")
+
+        # an index file of another root is useless for us
+        _Row = self.m_Connection.execute("SELECT value FROM meta WHERE key='root'").fetchone()
+        if _Row is None or _Row[0] != self.m_Root:
+            self.m_Connection.execute("DELETE FROM folders")
+            self.m_Connection.execute("DELETE FROM files")
+            self.m_Connection.execute("INSERT OR REPLACE INTO meta VALUES ('root', ?)", (self.m_Root,))
+        self.m_Connection.commit()
+
+    def Folders(self) -> dict:
+        """
+        all known folders
+        :return: dict relative folder -> [mtime, list of relative subfolders]
+        """
+        with self.m_Lock:
+            _Rows = self.m_Connection.execute("SELECT path, mtime, subfolders FROM folders").fetchall()
+        return {_Path: [_Mtime, _Subfolders.split("\0") if _Subfolders else []] for _Path, _Mtime, _Subfolders in _Rows}
+
+    def Structure(self) -> dict:
+        """
+        all known media files in the same format as Files_LoadAllFilesFromFolder:m_Structure
+        :return: dict relative folder -> list of relative files, empty folders are skipped
+        """
+        with self.m_Lock:
+            _Rows = self.m_Connection.execute("SELECT folder, path FROM files ORDER BY folder, path").fetchall()
+        _Structure = {}
+        for _Folder, _Path in _Rows:
+            _Structure.setdefault(_Folder, []).append(_Path)
+        return _Structure
+
+    def Files(self, f_Folder: str) -> list:
+        """
+        all known media files of a folder
+        :param f_Folder: relative folder
+        :return: list of [path, size, mtime, type]
+        """
+        with self.m_Lock:
+            _Rows = self.m_Connection.execute("SELECT path, size, mtime, type FROM files WHERE folder=? ORDER BY path", (f_Folder,)).fetchall()
+        return [list(_Row) for _Row in _Rows]
+
+    def Commit(self, f_Updates: list, f_Removed: list):
+        """
+        write the result of a rescan
+        :param f_Updates: list of [folder, mtime, subfolders, files] for every listed folder
+                          files is a list of [path, size, mtime, type]
+        :param f_Removed: list of folders that do not exist anymore
+        """
+        with self.m_Lock:
+            with self.m_Connection:
+                for _Folder in f_Removed:
+                    self.m_Connection.execute("DELETE FROM folders WHERE path=?", (_Folder,))
+                    self.m_Connection.execute("DELETE FROM files WHERE folder=?", (_Folder,))
+
+                for _Folder, _Mtime, _Subfolders, _Files in f_Updates:
+                    self.m_Connection.execute("INSERT OR REPLACE INTO folders VALUES (?, ?, ?)", (_Folder, _Mtime, "\0".join(_Subfolders)))
+                    self.m_Connection.execute("DELETE FROM files WHERE folder=?", (_Folder,))
+                    self.m_Connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                                                  [(_Path, _Folder, _Size, _File_Mtime, _Type) for _Path, _Size, _File_Mtime, _Type in _Files])
+
+    def Clear(self):
+        """ forget everything, the next scan lists all folders again """
+        with self.m_Lock:
+            with self.m_Connection:
+                self.m_Connection.execute("DELETE FROM folders")
+                self.m_Connection.execute("DELETE FROM files")
+
+    def Close(self):
+        """ close the index file """
+        with self.m_Lock:
+            self.m_Connection.close()
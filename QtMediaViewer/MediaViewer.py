@@ -5,21 +5,29 @@
 #
 # Media Viewer Widget
 #
-# IMPORTANT: os.listdir is the fastest way to scan directories
+# IMPORTANT: os.scandir is the fastest way to scan directories
 #
 # NOTES:
 # (process:16080): WARNING **: 16:50:28.480: unknown line join style undefined
 #  Add RedirectStandardError=True in igconfig.xml
 # ---------------------------------------------------------------------------
 import os
+import mimetypes
 import subprocess
-from PyQt5 import uic
 from PyQt5.QtWidgets import *
 
 from .Threads import *
-from PyQt5.QtCore import QTimer, pyqtSignal, QThread, Qt, QSize
+from .Cache import ThumbnailCache
+from .Index import FileIndex
+from .Model import MediaModel, MediaDelegate, MediaView
+from PyQt5.QtCore import QTimer, pyqtSignal, QThread, Qt, QSize, QFileSystemWatcher
 from PyQt5.QtGui import QImage, QPixmap, QIcon
-from PyQt5.QtMultimedia import QSound, QCamera
+
+# every .ui file is compiled once per process
+try:
+    from ..QtShared.Forms import LoadForm
+except:
+    from QtShared.Forms import LoadForm
 
 """ POPUP Window for delete confirmation """
 class PopUp_Delete(QWidget):
@@ -27,7 +35,7 @@ class PopUp_Delete(QWidget):
 
     def __init__(self, parent):
         super().__init__(parent)
-        uic.loadUi(os.path.dirname(os.path.realpath(__file__)) + '/Interface/PopUp-Delete.ui', self)
+        LoadForm(os.path.dirname(os.path.realpath(__file__)) + '/Interface/PopUp-Delete.ui', self)
         self.show()
 
         # center window
@@ -43,7 +51,7 @@ class PopUp_Delete(QWidget):
 class PopUp_Error(QWidget):
     def __init__(self, parent, f_Msg: str=""):
         super().__init__(parent)
-        uic.loadUi(os.path.dirname(os.path.realpath(__file__)) + '/Interface/PopUp-Error.ui', self)
+        LoadForm(os.path.dirname(os.path.realpath(__file__)) + '/Interface/PopUp-Error.ui', self)
         self.show()
 
         # center window
@@ -55,66 +63,11 @@ class PopUp_Error(QWidget):
         # add bindings
         self.pushButton_Close.clicked.connect(lambda e: self.deleteLater())
 
-class QWidget_Preview(QWidget):
-
-    m_Path_Abs: str = ""    # absolute file path
-    m_Path: str = ""        # Path to file without file itself
-    m_Filename: str = ""    # filename without extension and path
-    m_Extension: str = ""   # extension from file
-
-    m_Signal_NewName: pyqtSignal = pyqtSignal(str)  # signal with the new filename when everything works fine
-    m_Signal_Error: pyqtSignal = pyqtSignal(str)    # error message if something went wrong
-
-    def __init__(self, *args, **kwargs):
-        QWidget.__init__(self)
-        uic.loadUi(os.path.dirname(os.path.realpath(__file__)) + '/Interface/List_Item.ui', self)
-        self.UI_Filename.setReadOnly(True)
-
-    def SetFilePath(self, f_Path: str=""):
-        """ set path to file """
-        self.m_Path_Abs = f_Path
-        self.m_Path = os.path.split(os.path.abspath(self.m_Path_Abs))[0]
-        self.m_Extension = os.path.splitext(self.m_Path_Abs)[1]
-        self.m_Filename = os.path.basename(os.path.splitext(self.m_Path_Abs)[0])
-        self.UI_Filename.setText(os.path.basename(self.m_Filename))
-
-    def EnableFilenameEdit(self, f_Enable: bool=True):
-        """
-        enable on the fly renaming for files
-        :param f_Enable: bool True/False
-        :return:
-        """
-        self.m_Timer = QTimer()
-        self.m_Timer.setSingleShot(True)
-        self.m_Timer.timeout.connect(self._RenameFile)
-        self.UI_Filename.setReadOnly(False)
-        self.UI_Filename.keyReleaseEvent = lambda e: self.m_Timer.start(1000)
-
-    def _RenameFile(self):
-        """ rename our file in a new thread """
-        self.m_Thread_File_OnTheFlyRename = File_OnTheFlyRename()
-        self.m_Thread_File_OnTheFlyRename.m_Original = self.m_Path_Abs
-        self.m_Thread_File_OnTheFlyRename.m_NewName = os.path.join(self.m_Path, self.UI_Filename.text() + self.m_Extension)
-        self.m_Thread_File_OnTheFlyRename.m_Signal_NewName.connect(self._Finish_RenameFile)
-        self.m_Thread_File_OnTheFlyRename.m_Signal_Error.connect(self._Error_RenameFile)
-        self.m_Thread_File_OnTheFlyRename.start()
-
-    def _Finish_RenameFile(self, f_Result: str=""):
-        """ finish method for renameing """
-        # send signal and then update the vars
-        self.m_Signal_NewName.emit(f_Result)
-        self.SetFilePath(f_Result)
-
-    def _Error_RenameFile(self, f_Result: str=""):
-        """ finish method for error """
-        self.UI_Filename.setText(self.m_Filename)   # set Text back to original
-        self.m_Signal_Error.emit(f_Result)
-
 """ QListWidgetItem Header for our list """
 class QWidget_Header(QWidget):
     def __init__(self, *args, **kwargs):
         QWidget.__init__(self)
-        uic.loadUi(os.path.dirname(os.path.realpath(__file__)) + '/Interface/List_Header.ui', self)
+        LoadForm(os.path.dirname(os.path.realpath(__file__)) + '/Interface/List_Header.ui', self)
 
 
 """ QWidget Class for using MediaViewer """
@@ -124,17 +77,43 @@ class MediaViewer(QWidget):
     m_Directory: str = "/"          # media folder
     m_PreviewHeight: int = 200      # size for preview
     m_ZoomScale: int = 50           # zoom in/out steps
+    m_Cache_Path: str = ""          # thumbnail cache file, empty for the temp folder
+    m_Cache_Size: int = 512         # size cap of the thumbnail cache in MB
+    m_Preview_Workers: int = 0      # amount of threads for preview generation, 0 for the amount of cores
+    m_Index_Path: str = ""          # file index of the media folder, empty for the temp folder
+    m_Index_Workers: int = 8        # amount of threads for rescanning folders
+    m_Watcher_Delay: int = 500      # collect file system events for x ms before we rescan
+    m_Viewport_Delay: int = 50      # wait x ms after scrolling before previews get reprioritized
     m_Structure = {}                # saves our folder and file structure
 
     def __init__(self, *args, **kwargs):
         QWidget.__init__(self)
-        uic.loadUi(os.path.dirname(os.path.realpath(__file__)) + '/Interface/MediaViewer.ui', self)
+        LoadForm(os.path.dirname(os.path.realpath(__file__)) + '/Interface/MediaViewer.ui', self)
 
         # if valid **kwargs are available we set class vars
         for _Key in kwargs:
             if hasattr(self, _Key):
                 self.__setattr__(_Key, kwargs[_Key])
 
+        # persistent thumbnail cache shared by all preview threads
+        self.m_Cache = ThumbnailCache(self.m_Cache_Path, self.m_Cache_Size * 1024 * 1024)
+
+        # persistent file index, shown immediately and updated in the background
+        self.m_Index = FileIndex(self.m_Directory, self.m_Index_Path)
+
+        # bounded worker pool for preview generation
+        self.m_Scheduler = Files_PreviewScheduler(self.m_Preview_Workers)
+        self.m_Thread_Files_CalculatePreview = {}   # store our jobs for preview generation
+        self.m_PreviewHeight_Current = self.m_PreviewHeight  # preview height after zooming
+
+        # one model per folder, all painted by the same delegate
+        self.m_Models = {}                          # folder -> MediaModel
+        self.m_Views = {}                           # folder -> MediaView
+        self.m_Headers = {}                         # folder -> QWidget_Header
+        self.m_Delegate = MediaDelegate(self)
+        self.m_Delegate.m_Signal_Open.connect(self._OpenFile)
+        self.m_Delegate.m_Signal_Delete.connect(self._DeleteFile)
+
         # some UI Modifications
         # First show loading widget
         self.UI_StackedWidget.setCurrentIndex(self.UI_StackedWidget.indexOf(self.UI_Page_Loading))
@@ -150,163 +129,282 @@ class MediaViewer(QWidget):
         # watch filessystemwatcher
         self.m_Watcher = QFileSystemWatcher()
         self.m_Watcher.directoryChanged.connect(lambda e: self._Watcher_Directory(e))
+        self.m_Timer_Watcher = QTimer()
+        self.m_Timer_Watcher.setSingleShot(True)
+        self.m_Timer_Watcher.timeout.connect(self._Watcher_Rescan)
+
+        # after scrolling the previews of the viewport are calculated first
+        self.m_Timer_Viewport = QTimer()
+        self.m_Timer_Viewport.setSingleShot(True)
+        self.m_Timer_Viewport.timeout.connect(self._Viewport_Prioritize)
+        self.scrollArea.verticalScrollBar().valueChanged.connect(lambda e: self.m_Timer_Viewport.start(self.m_Viewport_Delay))
+
+    def SetDirectory(self, f_Directory: str):
+        """
+        show another media folder, a running scan gets cancelled
+        :param f_Directory: media folder
+        """
+        # the running scan still works with the old index
+        if hasattr(self, "m_Thread_Files_LoadAllFilesFromFolder"):
+            self.m_Thread_Files_LoadAllFilesFromFolder.Cancel()
+            self.m_Thread_Files_LoadAllFilesFromFolder.wait()
+
+        self.m_Directory = f_Directory
+        self.m_Index.Close()
+        self.m_Index = FileIndex(self.m_Directory, self.m_Index_Path)
+        for _Path in self.m_Watcher.directories():
+            self.m_Watcher.removePath(_Path)
+        self._Start_Thread_Files_LoadAllFilesFromFolder()
 
     def _Start_Thread_Files_LoadAllFilesFromFolder(self):
-        """ load files and folder in an async thread and create filelist """
+        """ load files and folder in an async thread and fill our filelist while it is running """
+        if hasattr(self, "m_Thread_Files_LoadAllFilesFromFolder"):
+            self.m_Thread_Files_LoadAllFilesFromFolder.Cancel()
+
         self.UI_StackedWidget.setCurrentIndex(self.UI_StackedWidget.indexOf(self.UI_Page_Loading))
         self._Layout_Clear(self.Contents_Layout)
-
-        self.m_Thread_Files_LoadAllFilesFromFolder = Files_LoadAllFilesFromFolder()
-        self.m_Thread_Files_LoadAllFilesFromFolder.m_Directory = self.m_Directory
-        self.m_Thread_Files_LoadAllFilesFromFolder.m_Signal_Result.connect(lambda e: self._Finish_Thread_Files_LoadAllFilesFromFolder(e))
-        self.m_Thread_Files_LoadAllFilesFromFolder.finished.connect(lambda: self.UI_StackedWidget.setCurrentIndex(self.UI_StackedWidget.indexOf(self.UI_MediaViewer)))
+        self.m_Scheduler.CancelAll()
+        self.m_Thread_Files_CalculatePreview = {}
+        self.m_Models = {}
+        self.m_Views = {}
+        self.m_Headers = {}
+
+        # results of an old thread are ignored... we only listen to the current one
+        _Thread = Files_LoadAllFilesFromFolder()
+        _Thread.m_Directory = self.m_Directory
+        _Thread.m_Index = self.m_Index
+        _Thread.m_Workers = self.m_Index_Workers
+        _Thread.m_Signal_Batch.connect(lambda e, f, x=_Thread: self._Batch_Thread_Files_LoadAllFilesFromFolder(x, e, f))
+        _Thread.m_Signal_Result.connect(lambda e, x=_Thread: self._Finish_Thread_Files_LoadAllFilesFromFolder(x, e))
+        self.m_Thread_Files_LoadAllFilesFromFolder = _Thread
         self.m_Thread_Files_LoadAllFilesFromFolder.start()
 
     def _Watcher_Directory(self, f_Path):
-        """ watches changes in our directory """
-        try: # on massive file changes this could crush here.. it is not as important so we skip it on error
-            if self.m_Thread_Files_LoadAllFilesFromFolder.isRunning():
-                return
-            self.m_Thread_Files_LoadAllFilesFromFolder = Files_LoadAllFilesFromFolder()
-            self.m_Thread_Files_LoadAllFilesFromFolder.m_Directory = self.m_Directory
-            self.m_Thread_Files_LoadAllFilesFromFolder.m_Signal_Result.connect(self.m_Watcher_Directory_Finish)
-            self.m_Thread_Files_LoadAllFilesFromFolder.start()
-        except:
-            pass
-
-    def m_Watcher_Directory_Finish(self, f_Result: dict):
-        """ watch our files and folders """
-        # check if a folder is added
-        if len(f_Result) != len(self.m_Structure):
-            self._Start_Thread_Files_LoadAllFilesFromFolder()
+        """ watches changes in our directory... bursts of changes are collected until it is quiet again """
+        self.m_Timer_Watcher.start(self.m_Watcher_Delay)
+
+    def _Watcher_Rescan(self):
+        """ rescan our directory, thanks to our index only changed folders are listed again """
+        if self.m_Thread_Files_LoadAllFilesFromFolder.isRunning():
+            self.m_Timer_Watcher.start(self.m_Watcher_Delay)   # try again when the current scan is done
             return
 
-        for _Folder in f_Result:
-            if _Folder not in self.m_Structure:
-                self._Start_Thread_Files_LoadAllFilesFromFolder()
-                return
-            if len(f_Result[_Folder]) != len(self.m_Structure[_Folder]):
-                self._Start_Thread_Files_LoadAllFilesFromFolder()
-                return
+        _Thread = Files_LoadAllFilesFromFolder()
+        _Thread.m_Directory = self.m_Directory
+        _Thread.m_Index = self.m_Index
+        _Thread.m_Workers = self.m_Index_Workers
+        _Thread.m_Signal_Result.connect(lambda e, x=_Thread: self.m_Watcher_Directory_Finish(x, e))
+        self.m_Thread_Files_LoadAllFilesFromFolder = _Thread
+        self.m_Thread_Files_LoadAllFilesFromFolder.start()
 
+    def m_Watcher_Directory_Finish(self, f_Thread: QThread, f_Result: dict):
+        """
+        patch our lists with the changes of our files and folders
+        :param f_Thread: thread that created f_Result
+        :param f_Result: contains all files and folder
+        """
+        if f_Thread is not self.m_Thread_Files_LoadAllFilesFromFolder:
+            return
+        self._ApplyStructure(f_Result, f_Thread.m_Renamed)
 
-    def _Finish_Thread_Files_LoadAllFilesFromFolder(self, f_Result: dict):
+    def _ApplyStructure(self, f_Result: dict, f_Renamed: dict):
         """
-        create our folder and file list from f_Result
+        bring our lists up to date without touching unchanged files
         :param f_Result: contains all files and folder
-        :return:
+        :param f_Renamed: relative folder -> list of [old, new] relative files
         """
+        # renamed files keep their preview
+        for _Folder in f_Renamed:
+            if _Folder in self.m_Models:
+                for _Old, _New in f_Renamed[_Folder]:
+                    self.m_Models[_Folder].RenameFile(self._AbsolutePath(_Old), self._AbsolutePath(_New))
+
+        # removed folders and files
+        for _Folder in list(self.m_Models):
+            if _Folder not in f_Result:
+                self._RemoveFolder(_Folder)
+                continue
+            _Files = set(self._AbsolutePath(_File) for _File in f_Result[_Folder])
+            for _File in [_File for _File in self.m_Models[_Folder].m_Files if _File not in _Files]:
+                self.m_Models[_Folder].RemoveFile(_File)
+                self.m_Scheduler.Cancel(_File)
+
+        # added folders and files
+        _Watched = set(self.m_Watcher.directories())
+        if self.m_Directory not in _Watched and os.path.isdir(self.m_Directory):
+            self.m_Watcher.addPath(self.m_Directory)   # new folders in our root
+            _Watched.add(self.m_Directory)
+        for _Folder in f_Result:
+            if _Folder not in self.m_Models:
+                self._AddFolder(_Folder)
+            self.m_Models[_Folder].AddFiles([self._AbsolutePath(_File) for _File in f_Result[_Folder]])
+
+            # start filesystem watchers
+            if self.m_Directory + _Folder not in _Watched:
+                self.m_Watcher.addPath(self.m_Directory + _Folder)
+
         self.m_Structure = f_Result
         if len(self.m_Structure) > 0:
             self.UI_FrameNoMedia.setVisible(False)
             self.UI_SpacerNoMedia.setVisible(False)
         else:
-            self.UI_StackedWidget.setCurrentIndex(self.UI_StackedWidget.indexOf(self.UI_MediaViewer))
             self.Contents_Layout.addWidget(self.UI_FrameNoMedia)
             self.Contents_Layout.addWidget(self.UI_SpacerNoMedia)
             self.UI_FrameNoMedia.setVisible(True)
             self.UI_SpacerNoMedia.setVisible(True)
 
-        _Mime_Picture = QPixmap()
-        _Mime_Picture.load(os.path.dirname(os.path.realpath(__file__)) + "/Images/Picture.png")
-        _Mime_Video = QPixmap()
-        _Mime_Video.load(os.path.dirname(os.path.realpath(__file__)) + "/Images/Video.png")
-       
-        # loop through all folder
-        for _Folder in self.m_Structure:
-            # start filesystem watchers
-            self.m_Watcher.addPath(self.m_Directory + _Folder)
-
-            _List = QListWidget()
-
-            # create header button with folder name only if we have mor than the root directory
-            if len(self.m_Structure) > 1 and len(self.m_Structure[_Folder]) > 0:
-                _Widget = QWidget_Header()
-                _Widget.UI_Button.setText(_Folder if _Folder != "" else "\\")
-                _Widget.UI_Button.mouseReleaseEvent = lambda e, x=self.m_Directory + _Folder: self._OpenFile(x)
-                self.Contents_Layout.addWidget(_Widget)
-
-                # toggle lists
-                def _Toggle(f_List, f_Label):
-                    _Hide = QPixmap()
-                    _Hide.load(os.path.dirname(os.path.realpath(__file__)) + "/Images/Plus.png")
-                    _Show = QPixmap()
-                    _Show.load(os.path.dirname(os.path.realpath(__file__)) + "/Images/Minus.png")
-                    if f_List.isVisible():
-                        f_Label.setPixmap(_Show)
-                        f_List.hide()
-                    else:
-                        f_Label.setPixmap(_Hide)
-                        f_List.show()
-                _Widget.UI_Label.mouseReleaseEvent = lambda e, x=_List, y=_Widget.UI_Label: _Toggle(x, y)
-
-            _List.setViewMode(QListView.IconMode)
-            _List.setResizeMode(QListView.Adjust)
-            _List.setAcceptDrops(False)
-            _List.setVerticalScrollMode(QListWidget.ScrollPerPixel)
-
-            _List.setSizeAdjustPolicy(QListWidget.AdjustToContents)
-            _List.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-            self.Contents_Layout.addWidget(_List)
-            self.m_Thread_Files_CalculatePreview = {} # store our threads for preview generation
-            for _File in self.m_Structure[_Folder]:
-                if _File[:1] == "\\": # if \ is the first char in _File os.path.join is not working
-                    _File = _File[1:]
-
-                _Item = QListWidgetItem()
-                _Widget = QWidget_Preview()
-                _Widget.SetFilePath(os.path.join(self.m_Directory, _File))
-                _Widget.EnableFilenameEdit(True)
-                _Widget.m_Signal_Error.connect(lambda e: PopUp_Error(self, e))
-                # always keep our m_Structure up to date! Very Important for QFileSystemWatcher
-                #_Widget.m_Signal_NewName.connect(lambda e, x=_Folder, y=_Widget: [self.m_Structure[x].remove(y.m_Filename+y.m_Extension), self.m_Structure[x].append(os.path.basename(e))])
-
-                _Widget.UI_Preview.setStyleSheet("border: 1px solid #AAA;;")
-                _Widget.UI_Preview.setAlignment(Qt.AlignCenter)
-                _Widget.UI_Preview.mouseReleaseEvent = lambda e, x=_Widget: self._OpenFile(x.m_Path_Abs)
-                _Widget.UI_Delete.mouseReleaseEvent = lambda e, x=_Item, y=_Widget: self._DeleteFile(x, y.m_Path_Abs)
-
-                _Item.setSizeHint(_Widget.sizeHint())
-                _List.addItem(_Item)
-                _List.setItemWidget(_Item, _Widget)
-
-                # create preview in a seperate thread
-                # because it could take some time
-                self.m_Thread_Files_CalculatePreview[os.path.join(self.m_Directory, _File)] = Files_CalculatePreview()
-                self.m_Thread_Files_CalculatePreview[os.path.join(self.m_Directory, _File)].m_PreviewHeight = self.m_PreviewHeight
-                self.m_Thread_Files_CalculatePreview[os.path.join(self.m_Directory, _File)].m_File = os.path.join(self.m_Directory, _File)
-                # what did i do here?
-                # get pixmap from thread and set it to qlabel
-                # update minimum width and height
-                # get size hint for widget and update itemwidget
-                # that takes time to figure out -.-
-                # doItemsLayout() updates GUI that it is shown without scaling problems
-                self.m_Thread_Files_CalculatePreview[os.path.join(self.m_Directory, _File)].m_Signal_Preview.connect(
-                    lambda w, x=_Widget, y=_Item, z=_List: [
-                        x.UI_Preview.setPixmap(w),
-                        #x.UI_Preview.setFixedWidth(w.width()),
-                        # x.UI_Preview.setFixedHeight(w.height()),
-                        x.adjustSize(),
-                        y.setSizeHint(x.sizeHint()),
-                        z.setItemWidget(y, x),
-                        z.doItemsLayout()])
-
-                # set mime type image
-                self.m_Thread_Files_CalculatePreview[os.path.join(self.m_Directory, _File)].m_Signal_MediaType.connect(lambda e, x=_Widget: x.UI_Mime.setPixmap(_Mime_Picture) if e=="picture" else x.UI_Mime.setPixmap(_Mime_Video))
-                self.m_Thread_Files_CalculatePreview[os.path.join(self.m_Directory, _File)].start()
-
-    def _DeleteFile(self, f_Widget: QListWidgetItem, f_File:str):
+    def _Batch_Thread_Files_LoadAllFilesFromFolder(self, f_Thread: QThread, f_Folder: str, f_Files: list):
+        """
+        add a batch of files to our folder and file list
+        :param f_Thread: thread that found the files
+        :param f_Folder: relative folder
+        :param f_Files: relative files of the folder
+        """
+        if f_Thread is not self.m_Thread_Files_LoadAllFilesFromFolder:
+            return
+
+        self.UI_StackedWidget.setCurrentIndex(self.UI_StackedWidget.indexOf(self.UI_MediaViewer))
+        if f_Folder not in self.m_Models:
+            self._AddFolder(f_Folder)
+        self.m_Models[f_Folder].AddFiles([self._AbsolutePath(_File) for _File in f_Files])
+
+    def _Finish_Thread_Files_LoadAllFilesFromFolder(self, f_Thread: QThread, f_Result: dict):
+        """
+        all folders and files are loaded
+        :param f_Thread: thread that created f_Result
+        :param f_Result: contains all files and folder
+        :return:
+        """
+        if f_Thread is not self.m_Thread_Files_LoadAllFilesFromFolder:
+            return
+
+        self.UI_StackedWidget.setCurrentIndex(self.UI_StackedWidget.indexOf(self.UI_MediaViewer))
+
+        # our index could be outdated... remove everything that is gone
+        self._ApplyStructure(f_Result, f_Thread.m_Renamed)
+
+    def _AddFolder(self, f_Folder: str):
+        """
+        create header, list and model of a folder
+        :param f_Folder: relative folder
+        """
+        _List = MediaView()
+
+        # create header button with folder name
+        # it is only shown if we have more than the root directory
+        _Widget = QWidget_Header()
+        _Widget.UI_Button.setText(f_Folder if f_Folder != "" else "\\")
+        _Widget.UI_Button.mouseReleaseEvent = lambda e, x=self.m_Directory + f_Folder: self._OpenFile(x)
+        self.Contents_Layout.addWidget(_Widget)
+
+        # toggle lists
+        def _Toggle(f_List, f_Label):
+            _Hide = QPixmap()
+            _Hide.load(os.path.dirname(os.path.realpath(__file__)) + "/Images/Plus.png")
+            _Show = QPixmap()
+            _Show.load(os.path.dirname(os.path.realpath(__file__)) + "/Images/Minus.png")
+            if f_List.isVisible():
+                f_Label.setPixmap(_Show)
+                f_List.hide()
+            else:
+                f_Label.setPixmap(_Hide)
+                f_List.show()
+        _Widget.UI_Label.mouseReleaseEvent = lambda e, x=_List, y=_Widget.UI_Label: _Toggle(x, y)
+        self.m_Headers[f_Folder] = _Widget
+        self.m_Views[f_Folder] = _List
+
+        # previews are requested by the model as soon as an item gets painted
+        _Model = MediaModel([], self.m_PreviewHeight_Current)
+        _Model.m_Signal_PreviewRequest.connect(lambda e, x=_Model: self._RequestPreview(x, e))
+        _Model.m_Signal_Error.connect(lambda e: PopUp_Error(self, e))
+        _Model.m_Signal_NewName.connect(lambda e, f, x=f_Folder: self._RenameInStructure(x, e, f))
+        self.m_Models[f_Folder] = _Model
+
+        _List.setModel(_Model)
+        _List.setItemDelegate(self.m_Delegate)
+        self.Contents_Layout.addWidget(_List)
+
+        for _Folder in self.m_Headers:
+            self.m_Headers[_Folder].setVisible(len(self.m_Headers) > 1)
+
+    def _RemoveFolder(self, f_Folder: str):
+        """
+        remove header, list and model of a folder
+        :param f_Folder: relative folder
+        """
+        for _File in self.m_Models[f_Folder].m_Files:
+            self.m_Scheduler.Cancel(_File)
+        self.m_Headers.pop(f_Folder).setParent(None)
+        self.m_Views.pop(f_Folder).setParent(None)
+        self.m_Models.pop(f_Folder)
+
+        for _Folder in self.m_Headers:
+            self.m_Headers[_Folder].setVisible(len(self.m_Headers) > 1)
+
+    def _RenameInStructure(self, f_Folder: str, f_Original: str, f_NewName: str):
+        """
+        always keep our m_Structure up to date! Very Important for QFileSystemWatcher
+        :param f_Folder: relative folder
+        :param f_Original: old absolute file path
+        :param f_NewName: new absolute file path
+        """
+        for _i, _File in enumerate(self.m_Structure.get(f_Folder, [])):
+            if self._AbsolutePath(_File) == f_Original:
+                self.m_Structure[f_Folder][_i] = os.path.join(os.path.dirname(_File), os.path.basename(f_NewName))
+                return
+
+    def _AbsolutePath(self, f_File: str) -> str:
+        """
+        absolute path of a file from our m_Structure
+        :param f_File: relative file
+        :return:
+        """
+        # if a separator is the first char in f_File os.path.join is not working
+        return os.path.join(self.m_Directory, f_File.lstrip("\\/"))
+
+    def _RequestPreview(self, f_Model: MediaModel, f_File: str):
+        """
+        create preview in our worker pool
+        because it could take some time
+        :param f_Model: model that wants the preview
+        :param f_File: absolute file path
+        """
+        if f_File not in self.m_Thread_Files_CalculatePreview:
+            _Job = Files_CalculatePreview()
+            _Job.m_Cache = self.m_Cache
+            _Job.m_File = f_File
+            _Job.m_Signal_Preview.connect(lambda e, x=f_Model, y=f_File: x.SetPreview(y, e))
+            self.m_Thread_Files_CalculatePreview[f_File] = _Job
+
+        _Job = self.m_Thread_Files_CalculatePreview[f_File]
+        _Job.m_PreviewHeight = f_Model.m_PreviewHeight
+        self.m_Scheduler.Schedule(_Job, Files_PreviewScheduler.PRIORITY_VISIBLE)
+
+    def _Viewport_Prioritize(self):
+        """ queued previews of the viewport run first, files that scrolled away have to wait """
+        _Visible = []
+        for _Folder, _View in self.m_Views.items():
+            _Rect = _View.viewport().visibleRegion().boundingRect()
+            if _Rect.isEmpty():
+                continue
+            _Model = self.m_Models[_Folder]
+            for _Row, _File in enumerate(_Model.m_Files):
+                if _View.visualRect(_Model.index(_Row)).intersects(_Rect):
+                    _Visible.append(_File)
+        self.m_Scheduler.Prioritize(_Visible)
+
+    def _DeleteFile(self, f_Model: MediaModel, f_File:str):
         """
         delete a picture from the preview list
-        :param f_Frame: QItem Widget to delete
+        :param f_Model: model that contains the file
         :param f_File: filename to delete
         :return:
         """
         def _Delete(f_Bool):
             try:
                 os.remove(f_File)
-                f_Widget.setHidden(True)
+                f_Model.RemoveFile(f_File)
+                self.m_Scheduler.Cancel(f_File)
             except:
                 _P = PopUp_Error(self, "Die Datei konnte nicht gelöscht werden.\nDer Zugriff wurde verweigert!")
 
@@ -315,18 +413,18 @@ class MediaViewer(QWidget):
 
     def _ZoomInOnPreview(self):
         """ regenerate preview pictures and zoom in """
-        for _File in self.m_Thread_Files_CalculatePreview:
-            self.m_Thread_Files_CalculatePreview[_File].m_PreviewHeight += self.m_ZoomScale
-            self.m_Thread_Files_CalculatePreview[_File].start()
+        self.m_PreviewHeight_Current += self.m_ZoomScale
+        for _Folder in self.m_Models:
+            self.m_Models[_Folder].SetPreviewHeight(self.m_PreviewHeight_Current)
 
     def _ZoomOutOnPreview(self):
         """ regenerate preview pictures and zoom in """
-        for _File in self.m_Thread_Files_CalculatePreview:
-            if self.m_Thread_Files_CalculatePreview[_File].m_PreviewHeight <= self.m_PreviewHeight:
-                return
+        if self.m_PreviewHeight_Current <= self.m_PreviewHeight:
+            return
 
-            self.m_Thread_Files_CalculatePreview[_File].m_PreviewHeight -= self.m_ZoomScale
-            self.m_Thread_Files_CalculatePreview[_File].start()
+        self.m_PreviewHeight_Current -= self.m_ZoomScale
+        for _Folder in self.m_Models:
+            self.m_Models[_Folder].SetPreviewHeight(self.m_PreviewHeight_Current)
 
     def _Layout_Clear(self, f_Layout: QLayout):
         """
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# QtMediaWidget model and delegate
+#
+# One MediaModel holds all files of one folder. The MediaDelegate paints
+# preview, mime badge, delete button and filename of an item, so no widget
+# is created per file. Previews are requested as soon as an item gets
+# painted for the first time - items outside the viewport cost nothing.
+# MediaView shows all items of a folder without its own scrollbar, the
+# scrollarea of MediaViewer scrolls all folders at once.
+# ---------------------------------------------------------------------------
+import os
+import mimetypes
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt5.QtGui import QPixmap, QImage, QFont, QFontMetrics, QColor, QPen
+from PyQt5.QtWidgets import QStyledItemDelegate, QLineEdit, QListView, QSizePolicy
+
+from .Threads import File_OnTheFlyRename
+
+
+"""
+Model with all media files of a folder
+"""
+class MediaModel(QAbstractListModel):
+    ROLE_PATH: int = Qt.UserRole + 1        # absolute file path
+    ROLE_MEDIATYPE: int = Qt.UserRole + 2   # "picture" or "video"
+
+    m_Signal_PreviewRequest: pyqtSignal = pyqtSignal(str)   # file that needs a preview with m_PreviewHeight
+    m_Signal_NewName: pyqtSignal = pyqtSignal(str, str)     # old and new filename when renaming works fine
+    m_Signal_Error: pyqtSignal = pyqtSignal(str)            # error message if something went wrong
+
+    def __init__(self, f_Files: list, f_PreviewHeight: int = 200):
+        """
+        :param f_Files: list with absolute file paths
+        :param f_PreviewHeight: height of the previews
+        """
+        QAbstractListModel.__init__(self)
+        self.m_PreviewHeight = f_PreviewHeight
+        self.m_Files = list(f_Files)    # absolute file paths
+        self.m_Rows = {}                # file -> row
+        self.m_Previews = {}            # file -> QPixmap in the height of a pyramid level
+        self.m_Scaled = {}              # file -> QPixmap scaled to m_PreviewHeight
+        self.m_Requested = set()        # files with a requested preview in m_PreviewHeight
+        self.m_Threads_Rename = {}      # file -> File_OnTheFlyRename
+        self._UpdateRows()
+
+    def rowCount(self, f_Parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if f_Parent.isValid() else len(self.m_Files)
+
+    def flags(self, f_Index: QModelIndex):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def data(self, f_Index: QModelIndex, f_Role: int = Qt.DisplayRole):
+        if not f_Index.isValid() or f_Index.row() >= len(self.m_Files):
+            return None
+        _File = self.m_Files[f_Index.row()]
+
+        if f_Role in (Qt.DisplayRole, Qt.EditRole):
+            return os.path.splitext(os.path.basename(_File))[0]
+
+        if f_Role == Qt.DecorationRole:
+            # only painted items ask for a preview... or for a bigger pyramid level
+            _Preview = self.m_Previews.get(_File)
+            if (_Preview is None or _Preview.height() < self.m_PreviewHeight) and _File not in self.m_Requested:
+                self.m_Requested.add(_File)
+                self.m_Signal_PreviewRequest.emit(_File)
+            if _Preview is None or _Preview.height() == self.m_PreviewHeight:
+                return _Preview
+
+            # zooming is done here, once per zoom step and item
+            if _File not in self.m_Scaled:
+                self.m_Scaled[_File] = _Preview.scaledToHeight(self.m_PreviewHeight, Qt.SmoothTransformation)
+            return self.m_Scaled[_File]
+
+        if f_Role == Qt.ToolTipRole:
+            return os.path.basename(_File)
+
+        if f_Role == self.ROLE_PATH:
+            return _File
+
+        if f_Role == self.ROLE_MEDIATYPE:
+            _MimeType = mimetypes.guess_type(_File)[0] or ""
+            return "video" if _MimeType.startswith("video") else "picture"
+
+        return None
+
+    def setData(self, f_Index: QModelIndex, f_Value, f_Role: int = Qt.EditRole) -> bool:
+        """ rename our file in a new thread """
+        if f_Role != Qt.EditRole or not f_Index.isValid():
+            return False
+
+        _Original = self.m_Files[f_Index.row()]
+        _NewName = os.path.join(os.path.dirname(_Original), str(f_Value) + os.path.splitext(_Original)[1])
+        if str(f_Value).strip() == "" or _NewName == _Original:
+            return False
+
+        self.m_Threads_Rename[_Original] = File_OnTheFlyRename()
+        self.m_Threads_Rename[_Original].m_Original = _Original
+        self.m_Threads_Rename[_Original].m_NewName = _NewName
+        self.m_Threads_Rename[_Original].m_Signal_NewName.connect(lambda e, x=_Original: self.RenameFile(x, e))
+        self.m_Threads_Rename[_Original].m_Signal_Error.connect(self.m_Signal_Error.emit)
+        self.m_Threads_Rename[_Original].start()
+        return True
+
+    def SetPreview(self, f_File: str, f_Image: QImage):
+        """
+        store the preview of a file
+        :param f_File: absolute file path
+        :param f_Image: preview image from Files_CalculatePreview
+        """
+        if f_File not in self.m_Rows:
+            return
+        self.m_Previews[f_File] = QPixmap.fromImage(f_Image)
+        self.m_Scaled.pop(f_File, None)
+        _Index = self.index(self.m_Rows[f_File])
+        self.dataChanged.emit(_Index, _Index, [Qt.DecorationRole])
+
+    def SetPreviewHeight(self, f_Height: int):
+        """
+        change the height of all previews
+        our pyramid levels are scaled, a bigger level is only calculated if needed
+        :param f_Height: new preview height
+        """
+        self.layoutAboutToBeChanged.emit()
+        self.m_PreviewHeight = f_Height
+        self.m_Requested.clear()
+        self.m_Scaled.clear()
+        self.layoutChanged.emit()
+
+    def AddFile(self, f_File: str):
+        """
+        append a file to the model
+        :param f_File: absolute file path
+        """
+        if f_File in self.m_Rows:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.m_Files), len(self.m_Files))
+        self.m_Files.append(f_File)
+        self.m_Rows[f_File] = len(self.m_Files) - 1
+        self.endInsertRows()
+
+    def AddFiles(self, f_Files: list):
+        """
+        append a batch of files to the model
+        :param f_Files: list with absolute file paths
+        """
+        _Files = [_File for _File in f_Files if _File not in self.m_Rows]
+        if len(_Files) == 0:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.m_Files), len(self.m_Files) + len(_Files) - 1)
+        for _File in _Files:
+            self.m_Rows[_File] = len(self.m_Files)
+            self.m_Files.append(_File)
+        self.endInsertRows()
+
+    def RemoveFile(self, f_File: str):
+        """
+        remove a file from the model
+        :param f_File: absolute file path
+        """
+        if f_File not in self.m_Rows:
+            return
+        _Row = self.m_Rows[f_File]
+        self.beginRemoveRows(QModelIndex(), _Row, _Row)
+        del self.m_Files[_Row]
+        self.m_Previews.pop(f_File, None)
+        self.m_Scaled.pop(f_File, None)
+        self.m_Requested.discard(f_File)
+        self._UpdateRows()
+        self.endRemoveRows()
+
+    def RenameFile(self, f_Original: str, f_NewName: str):
+        """
+        a file got a new name, the preview stays the same
+        :param f_Original: old absolute file path
+        :param f_NewName: new absolute file path
+        """
+        if f_Original not in self.m_Rows:
+            return
+        if f_NewName in self.m_Rows: # new name is already listed
+            self.RemoveFile(f_Original)
+            return
+        _Row = self.m_Rows.pop(f_Original)
+        self.m_Files[_Row] = f_NewName
+        self.m_Rows[f_NewName] = _Row
+        if f_Original in self.m_Previews:
+            self.m_Previews[f_NewName] = self.m_Previews.pop(f_Original)
+        if f_Original in self.m_Scaled:
+            self.m_Scaled[f_NewName] = self.m_Scaled.pop(f_Original)
+        if f_Original in self.m_Requested:
+            self.m_Requested.discard(f_Original)
+            self.m_Requested.add(f_NewName)
+
+        _Index = self.index(_Row)
+        self.dataChanged.emit(_Index, _Index)
+        self.m_Signal_NewName.emit(f_Original, f_NewName)
+
+    def _UpdateRows(self):
+        """ rebuild our file -> row lookup """
+        self.m_Rows = {_File: _Row for _Row, _File in enumerate(self.m_Files)}
+
+
+"""
+Delegate that paints our media items
+looks like the old List_Item.ui
+"""
+class MediaDelegate(QStyledItemDelegate):
+    SIDE_WIDTH: int = 40    # width of the delete button and mime badge column
+    MARGIN: int = 2         # margin around an item
+
+    m_Signal_Open: pyqtSignal = pyqtSignal(str)             # preview was clicked
+    m_Signal_Delete: pyqtSignal = pyqtSignal(object, str)   # delete button was clicked (model, file)
+
+    def __init__(self, parent=None):
+        QStyledItemDelegate.__init__(self, parent)
+
+        # load everything once... paint gets called a lot
+        _Path = os.path.dirname(os.path.realpath(__file__)) + "/Images/"
+        self.m_Pixmap_Delete = QPixmap(_Path + "Delete.png").scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.m_Pixmap_Picture = QPixmap(_Path + "Picture.png")
+        self.m_Pixmap_Video = QPixmap(_Path + "Video.png")
+        self.m_Font = QFont("voestalpine", 12)
+        self.m_FontMetrics = QFontMetrics(self.m_Font)
+        self.m_Pen_Border = QPen(QColor("#AAAAAA"))
+        self.m_Color_Delete = QColor("#FF7F7F")
+        self.m_Color_Background = QColor("#FFFFFF")
+
+    def _Rects(self, f_Rect: QRect, f_Height: int) -> dict:
+        """
+        calculate the areas of an item
+        :param f_Rect: rect of the whole item
+        :param f_Height: preview height
+        :return: dict with preview, delete, mime and name rect
+        """
+        _X = f_Rect.x() + self.MARGIN
+        _Y = f_Rect.y() + self.MARGIN
+        _Width = f_Height * 4 // 3
+        _Name_Height = self.m_FontMetrics.height() + 8
+        return {
+            "preview": QRect(_X, _Y, _Width, f_Height),
+            "delete": QRect(_X + _Width, _Y, self.SIDE_WIDTH, f_Height // 2),
+            "mime": QRect(_X + _Width, _Y + f_Height // 2, self.SIDE_WIDTH, f_Height - f_Height // 2),
+            "name": QRect(_X, _Y + f_Height, _Width + self.SIDE_WIDTH, _Name_Height),
+        }
+
+    def sizeHint(self, f_Option, f_Index) -> QSize:
+        _Height = f_Index.model().m_PreviewHeight
+        return QSize(_Height * 4 // 3 + self.SIDE_WIDTH + 2 * self.MARGIN,
+                     _Height + self.m_FontMetrics.height() + 8 + 2 * self.MARGIN)
+
+    def paint(self, f_Painter, f_Option, f_Index):
+        _Rects = self._Rects(f_Option.rect, f_Index.model().m_PreviewHeight)
+        f_Painter.save()
+
+        # preview - old previews get scaled until the new one is calculated
+        f_Painter.setPen(self.m_Pen_Border)
+        f_Painter.fillRect(_Rects["preview"], self.m_Color_Background)
+        _Preview = f_Index.data(Qt.DecorationRole)
+        if _Preview is not None and not _Preview.isNull():
+            _Size = _Preview.size().scaled(_Rects["preview"].size() - QSize(2, 2), Qt.KeepAspectRatio)
+            _Target = QRect(0, 0, _Size.width(), _Size.height())
+            _Target.moveCenter(_Rects["preview"].center())
+            f_Painter.drawPixmap(_Target, _Preview)
+        f_Painter.drawRect(_Rects["preview"].adjusted(0, 0, -1, -1))
+
+        # delete button
+        f_Painter.fillRect(_Rects["delete"], self.m_Color_Delete)
+        f_Painter.drawRect(_Rects["delete"].adjusted(0, 0, -1, -1))
+        self._DrawCentered(f_Painter, _Rects["delete"], self.m_Pixmap_Delete)
+
+        # mime badge
+        f_Painter.fillRect(_Rects["mime"], self.m_Color_Background)
+        f_Painter.drawRect(_Rects["mime"].adjusted(0, 0, -1, -1))
+        _Mime = self.m_Pixmap_Video if f_Index.data(MediaModel.ROLE_MEDIATYPE) == "video" else self.m_Pixmap_Picture
+        self._DrawCentered(f_Painter, _Rects["mime"], _Mime)
+
+        # filename
+        f_Painter.fillRect(_Rects["name"], self.m_Color_Background)
+        f_Painter.drawRect(_Rects["name"].adjusted(0, 0, -1, -1))
+        f_Painter.setFont(self.m_Font)
+        f_Painter.setPen(f_Option.palette.text().color())
+        _Text_Rect = _Rects["name"].adjusted(4, 0, -4, 0)
+        f_Painter.drawText(_Text_Rect, Qt.AlignVCenter | Qt.AlignLeft,
+                           self.m_FontMetrics.elidedText(f_Index.data(Qt.DisplayRole), Qt.ElideRight, _Text_Rect.width()))
+
+        f_Painter.restore()
+
+    @staticmethod
+    def _DrawCentered(f_Painter, f_Rect: QRect, f_Pixmap: QPixmap):
+        """ draw a pixmap in the middle of a rect """
+        f_Painter.drawPixmap(f_Rect.x() + (f_Rect.width() - f_Pixmap.width()) // 2,
+                             f_Rect.y() + (f_Rect.height() - f_Pixmap.height()) // 2,
+                             f_Pixmap)
+
+    def editorEvent(self, f_Event, f_Model, f_Option, f_Index) -> bool:
+        """ clicks on our painted buttons """
+        if f_Event.type() != QEvent.MouseButtonRelease or f_Event.button() != Qt.LeftButton:
+            return QStyledItemDelegate.editorEvent(self, f_Event, f_Model, f_Option, f_Index)
+
+        _Rects = self._Rects(f_Option.rect, f_Model.m_PreviewHeight)
+        if _Rects["delete"].contains(f_Event.pos()):
+            self.m_Signal_Delete.emit(f_Model, f_Index.data(MediaModel.ROLE_PATH))
+            return True
+        if _Rects["preview"].contains(f_Event.pos()):
+            self.m_Signal_Open.emit(f_Index.data(MediaModel.ROLE_PATH))
+            return True
+        if _Rects["name"].contains(f_Event.pos()) and f_Option.widget is not None:
+            f_Option.widget.edit(f_Index)
+            return True
+        return False
+
+    def createEditor(self, f_Parent, f_Option, f_Index):
+        """ inline rename """
+        _Editor = QLineEdit(f_Parent)
+        _Editor.setFont(self.m_Font)
+        _Editor.setStyleSheet("border: 1px solid #AAA; padding:3px; background: #FFF;")
+        _Editor.setPlaceholderText("Bildname...")
+        return _Editor
+
+    def setEditorData(self, f_Editor, f_Index):
+        f_Editor.setText(f_Index.data(Qt.EditRole))
+
+    def setModelData(self, f_Editor, f_Model, f_Index):
+        f_Model.setData(f_Index, f_Editor.text(), Qt.EditRole)
+
+    def updateEditorGeometry(self, f_Editor, f_Option, f_Index):
+        f_Editor.setGeometry(self._Rects(f_Option.rect, f_Index.model().m_PreviewHeight)["name"])
+
+
+"""
+Icon view for one folder
+grows with its contents, our MediaViewer scrollarea does the scrolling
+"""
+class MediaView(QListView):
+    def __init__(self, parent=None):
+        QListView.__init__(self, parent)
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)     # layout without asking every item for its size
+        self.setSpacing(2)
+        self.setAcceptDrops(False)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setEditTriggers(QListView.NoEditTriggers)     # the delegate opens the editor on click
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+    def updateGeometries(self):
+        """ called after every layout... adjust our height to the contents """
+        QListView.updateGeometries(self)
+        _Height = 2 * self.frameWidth()
+        if self.model() is not None and self.model().rowCount() > 0:
+            _Last = self.visualRect(self.model().index(self.model().rowCount() - 1, 0))
+            _Height += _Last.bottom() + 1 + self.verticalOffset() + self.spacing()
+        if _Height != self.height():
+            self.setFixedHeight(_Height)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# QtMediaWidget poster frames of videos
+#
+# Used by the preview threads of QtMediaViewer and by QtCamera.
+# Only the first frame is decoded - it is always a keyframe, so no seek is
+# needed. The frame is scaled down in BGR and handed to Qt without a color
+# conversion. Codec setup is the expensive part, so only a few decoders may
+# be open at the same time and the results are kept in a small LRU cache.
+# cv2 is imported with the first video, not with this module.
+# ---------------------------------------------------------------------------
+import os
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtGui import QImage
+
+# Qt >= 5.14 takes opencv frames without a color conversion
+FORMAT_BGR888 = getattr(QImage, "Format_BGR888", None)
+
+
+class PosterFrame:
+
+    m_MaxDecoders: int = 2                  # video decoders that may be open at the same time
+    m_CacheSize: int = 64                   # amount of poster frames we keep in memory
+
+    m_Semaphore = threading.BoundedSemaphore(m_MaxDecoders)
+    m_Lock = threading.Lock()
+    m_Cache = OrderedDict()                 # (path, mtime, size, height, width) -> QImage
+
+    @classmethod
+    def SetMaxDecoders(cls, f_Count: int):
+        """
+        change the amount of decoders that may be open at the same time
+        only call this while no frame is extracted
+        :param f_Count: amount of decoders
+        """
+        cls.m_MaxDecoders = max(1, f_Count)
+        cls.m_Semaphore = threading.BoundedSemaphore(cls.m_MaxDecoders)
+
+    @classmethod
+    def Extract(cls, f_File: str, f_Height: int = 0, f_Width: int = 0) -> QImage:
+        """
+        get the poster frame of a video
+        :param f_File: path to the video
+        :param f_Height: height of the poster, 0 to use f_Width
+        :param f_Width: width of the poster if f_Height is 0, both 0 for the original size
+        :return: poster frame, null image if the video can't be decoded
+        """
+        try:
+            _Stat = os.stat(f_File)
+        except OSError:
+            return QImage()
+        _Key = (os.path.abspath(f_File), _Stat.st_mtime_ns, _Stat.st_size, f_Height, f_Width)
+
+        with cls.m_Lock:
+            if _Key in cls.m_Cache:
+                cls.m_Cache.move_to_end(_Key)
+                return cls.m_Cache[_Key]
+
+        import cv2
+        with cls.m_Semaphore:
+            _Cap = cv2.VideoCapture(f_File)
+            try:
+                _Ret, _Frame = _Cap.read()
+            finally:
+                _Cap.release()
+        if not _Ret or _Frame is None:
+            return QImage()
+
+        _Image = cls.FrameToImage(_Frame, f_Height, f_Width)
+
+        with cls.m_Lock:
+            cls.m_Cache[_Key] = _Image
+            while len(cls.m_Cache) > cls.m_CacheSize:
+                cls.m_Cache.popitem(last=False)
+        return _Image
+
+    @staticmethod
+    def FrameToImage(f_Frame, f_Height: int = 0, f_Width: int = 0) -> QImage:
+        """
+        scale an opencv frame and convert it to a QImage that owns its memory
+        :param f_Frame: BGR frame
+        :param f_Height: height of the image, 0 to use f_Width
+        :param f_Width: width of the image if f_Height is 0, both 0 for the original size
+        :return: image
+        """
+        import cv2
+        h, w = f_Frame.shape[:2]
+        if f_Height > 0 and f_Height < h:
+            f_Frame = cv2.resize(f_Frame, (max(1, round(w * f_Height / h)), f_Height), interpolation=cv2.INTER_AREA)
+        elif f_Height <= 0 and 0 < f_Width < w:
+            f_Frame = cv2.resize(f_Frame, (f_Width, max(1, round(h * f_Width / w))), interpolation=cv2.INTER_AREA)
+
+        h, w = f_Frame.shape[:2]
+        if FORMAT_BGR888 is not None:
+            return QImage(f_Frame.data, w, h, f_Frame.strides[0], FORMAT_BGR888).copy()
+        # rgbSwapped() gives us a copy as well
+        return QImage(f_Frame.data, w, h, f_Frame.strides[0], QImage.Format_RGB888).rgbSwapped()
+
+    @classmethod
+    def Clear(cls):
+        """ forget all cached poster frames """
+        with cls.m_Lock:
+            cls.m_Cache.clear()
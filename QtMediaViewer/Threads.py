@@ -6,39 +6,65 @@
 # QtMediaWidget QThreads
 # ---------------------------------------------------------------------------
 import os
-import cv2
+import heapq
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import mimetypes
 import stat
-from PyQt5.Qt import *
-from PyQt5.QtCore import QThread, pyqtSignal
-from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtCore import Qt, QThread, QThreadPool, QRunnable, QObject, pyqtSignal, QBuffer, QIODevice, QSize
+from PyQt5.QtGui import QPixmap, QImage, QImageReader
+
+from .Cache import ThumbnailCache
+from .Index import FileIndex
+from .Poster import PosterFrame
 
 
 """
 Load all Files from a Folder
+streams the result folder by folder, a big folder is split into batches
 """
 class Files_LoadAllFilesFromFolder(QThread):
 
     m_Directory: str = "/"     # folder that we are going through
+    m_BatchSize: int = 500     # maximum amount of files per batch
+    m_Index: FileIndex = None  # persistent file index, None for a full walk
+    m_Workers: int = 8         # threads for listing folders in parallel when we have an index
 
     m_Structure: dict = {}      # data holder for our files
+    m_Renamed: dict = {}        # relative folder -> list of [old, new] relative files, only found with an index
 
-    m_Signal_Result = pyqtSignal(dict)
+    m_Signal_Batch = pyqtSignal(str, list)  # relative folder and a batch of its files
+    m_Signal_Result = pyqtSignal(dict)      # whole structure when everything is done
 
     def run(self):
         self.m_Structure = {}
-        self._Recursive_Walk(self.m_Directory)
+        self.m_Renamed = {}
+        if self.m_Index is None:
+            self._Recursive_Walk(self.m_Directory)
+        else:
+            self._Reconcile()
+
+        # cancelled: the result would be incomplete
+        if self.isInterruptionRequested():
+            return
         self.m_Signal_Result.emit(self.m_Structure)
 
-    def _HasHiddenAttribute(self, f_Path: str):
+    def Cancel(self):
+        """ stop walking through our directory, no more signals are sent """
+        self.requestInterruption()
+
+    @staticmethod
+    def _IsHidden(f_Entry: os.DirEntry) -> bool:
         """
-        check if a file or folder has hidden attributes
-        :param f_Path: path to file/folder
+        check if a file or folder is hidden
+        windows gets the attributes from the directory listing, no extra stat needed
+        :param f_Entry: entry from os.scandir
         :return:
         """
+        if os.name != "nt": # no hidden attribute outside of windows
+            return f_Entry.name.startswith(".")
         try: # try to get stats... or hide file anyway
-            return bool(os.stat(f_Path).st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN)
-        except:
+            return bool(f_Entry.stat().st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN)
+        except OSError:
             return True
 
     def _Recursive_Walk(self, f_Dir: str=""):
@@ -48,71 +74,426 @@ class Files_LoadAllFilesFromFolder(QThread):
 
         # add relative path to our m_Structure
         _Relative_Path = f_Dir.replace(self.m_Directory, "")
-        if _Relative_Path not in self.m_Structure:
-            self.m_Structure[_Relative_Path] = []
+        _Files = []
+        _Batch = []
+        _Folders = []
 
         # load files from folder
-        for _File in os.listdir(f_Dir):
-            # skip hidden files and folders
-            if self._HasHiddenAttribute(os.path.join(f_Dir, _File)):
-                continue
+        try:
+            _Entries = os.scandir(f_Dir)
+        except OSError:
+            return
+        with _Entries:
+            for _Entry in _Entries:
+                if self.isInterruptionRequested():
+                    return
 
-            # folder: go recursive
-            if os.path.isdir(os.path.join(f_Dir, _File)):
-                self._Recursive_Walk(os.path.join(f_Dir, _File))
+                # skip hidden files and folders
+                if self._IsHidden(_Entry):
+                    continue
 
-            # if you are not a file we dont need ya! Go away!
-            if mimetypes.guess_type(os.path.join(f_Dir, _File))[0] == None:
-                continue
+                try:
+                    # folder: go recursive after this folder is done
+                    if _Entry.is_dir():
+                        _Folders.append(_Entry.path)
+                        continue
 
-            # no video or image? Go away
-            _Type = mimetypes.guess_type(os.path.join(f_Dir, _File))[0].split("/")[0]
-            if _Type not in ("video", "image"):
-                continue
+                    # WTF are you?
+                    if not _Entry.is_file():
+                        continue
+                except OSError:
+                    continue
+
+                # no video or image? Go away
+                _MimeType = mimetypes.guess_type(_Entry.name)[0]
+                if _MimeType is None or _MimeType.split("/")[0] not in ("video", "image"):
+                    continue
+
+                _File = os.path.join(_Relative_Path, _Entry.name)
+                _Files.append(_File)
+                _Batch.append(_File)
+
+                # big folders are shown before we are through
+                if len(_Batch) >= self.m_BatchSize:
+                    self.m_Signal_Batch.emit(_Relative_Path, _Batch)
+                    _Batch = []
+
+        if len(_Batch) > 0:
+            self.m_Signal_Batch.emit(_Relative_Path, _Batch)
+
+        # empty folders are not added to our m_Structure
+        if len(_Files) > 0:
+            self.m_Structure[_Relative_Path] = _Files
+
+        for _Folder in _Folders:
+            self._Recursive_Walk(_Folder)
+
+
+    def _Reconcile(self):
+        """
+        show our index immediately and bring it up to date afterwards
+        folders are listed in parallel and only if their mtime changed
+        """
+        _Known = self.m_Index.Folders()
+        _Structure = self.m_Index.Structure()
+        for _Folder in _Structure:
+            self._EmitBatches(_Folder, _Structure[_Folder])
+
+        _Seen = set()
+        _Updates = []
+        _Pool = ThreadPoolExecutor(max_workers=self.m_Workers)
+        try:
+            _Pending = {_Pool.submit(self._ListFolder, self.m_Directory, _Known)}
+            while len(_Pending) > 0:
+                if self.isInterruptionRequested():
+                    return
+
+                _Done, _Pending = wait(_Pending, return_when=FIRST_COMPLETED)
+                for _Future in _Done:
+                    _Result = _Future.result()
+                    if _Result is None: # folder is gone or not accessible
+                        continue
+                    _Folder, _Mtime, _Subfolders, _Files = _Result
+                    _Seen.add(_Folder)
+
+                    for _Subfolder in _Subfolders:
+                        _Pending.add(_Pool.submit(self._ListFolder, self.m_Directory + _Subfolder, _Known))
+
+                    # unchanged folder
+                    if _Files is None:
+                        continue
 
-            # WTF are you?
-            if not os.path.isfile(os.path.join(f_Dir, _File)):
+                    _Updates.append([_Folder, _Mtime, _Subfolders, _Files])
+                    if _Folder in _Known:
+                        self._FindRenamed(_Folder, _Files)
+                    _Old = set(_Structure.get(_Folder, []))
+                    _Structure[_Folder] = [_File[0] for _File in _Files]
+                    self._EmitBatches(_Folder, [_File for _File in _Structure[_Folder] if _File not in _Old])
+        finally:
+            _Pool.shutdown(wait=True, cancel_futures=True)
+
+        _Removed = [_Folder for _Folder in _Known if _Folder not in _Seen]
+        self.m_Index.Commit(_Updates, _Removed)
+
+        # same format as _Recursive_Walk, parents before their children
+        for _Folder in sorted(_Structure):
+            if _Folder in _Seen and len(_Structure[_Folder]) > 0:
+                self.m_Structure[_Folder] = _Structure[_Folder]
+
+    def _FindRenamed(self, f_Folder: str, f_Files: list):
+        """
+        a renamed file keeps its size and mtime
+        :param f_Folder: relative folder
+        :param f_Files: new list of [path, size, mtime, type]
+        """
+        _Old = self.m_Index.Files(f_Folder)
+        _Paths_Old = set(_File[0] for _File in _Old)
+        _Paths_New = set(_File[0] for _File in f_Files)
+
+        # only unique size/mtime pairs... everything else is too vague
+        _Removed = {}
+        for _Path, _Size, _Mtime, _ in _Old:
+            if _Path not in _Paths_New:
+                _Key = (_Size, _Mtime)
+                _Removed[_Key] = None if _Key in _Removed else _Path
+
+        for _Path, _Size, _Mtime, _ in f_Files:
+            if _Path in _Paths_Old or _Removed.get((_Size, _Mtime)) is None:
                 continue
+            self.m_Renamed.setdefault(f_Folder, []).append([_Removed.pop((_Size, _Mtime)), _Path])
+
+    def _ListFolder(self, f_Dir: str, f_Known: dict):
+        """
+        list one folder, runs in our worker pool
+        :param f_Dir: absolute folder
+        :param f_Known: folders from our index
+        :return: [relative folder, mtime, relative subfolders, files or None if unchanged] or None on error
+        """
+        _Relative_Path = f_Dir.replace(self.m_Directory, "", 1)
+        try:
+            _Mtime = os.stat(f_Dir).st_mtime_ns
+        except OSError:
+            return None
 
-            self.m_Structure[_Relative_Path].append(os.path.join(_Relative_Path, _File))
+        if _Relative_Path in f_Known and f_Known[_Relative_Path][0] == _Mtime:
+            return [_Relative_Path, _Mtime, f_Known[_Relative_Path][1], None]
 
-        # check if this folder was empty and remove it again from list
-        if len(self.m_Structure[_Relative_Path]) == 0:
-            del self.m_Structure[_Relative_Path]
+        _Files = []
+        _Folders = []
+        try:
+            with os.scandir(f_Dir) as _Entries:
+                for _Entry in _Entries:
+                    if self._IsHidden(_Entry):
+                        continue
+                    try:
+                        if _Entry.is_dir():
+                            _Folders.append(_Entry.path.replace(self.m_Directory, "", 1))
+                            continue
+                        if not _Entry.is_file():
+                            continue
+
+                        _MimeType = mimetypes.guess_type(_Entry.name)[0]
+                        if _MimeType is None or _MimeType.split("/")[0] not in ("video", "image"):
+                            continue
+
+                        _Stat = _Entry.stat()
+                        _Files.append([os.path.join(_Relative_Path, _Entry.name), _Stat.st_size, _Stat.st_mtime_ns, _MimeType.split("/")[0]])
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        _Files.sort()
+        _Folders.sort()
+        return [_Relative_Path, _Mtime, _Folders, _Files]
+
+    def _EmitBatches(self, f_Folder: str, f_Files: list):
+        """ send files of a folder in batches of m_BatchSize """
+        for _i in range(0, len(f_Files), self.m_BatchSize):
+            self.m_Signal_Batch.emit(f_Folder, f_Files[_i:_i + self.m_BatchSize])
+
+
+"""
+Signals for our preview jobs
+QRunnable is no QObject so the signals live in a helper class
+"""
+class Files_CalculatePreview_Signals(QObject):
+    m_Signal_Preview: pyqtSignal = pyqtSignal(QImage)       # signal for the preview image, QPixmap is only allowed in the gui thread
+    m_Signal_Finished: pyqtSignal = pyqtSignal(str)         # signal with the file when the job is done
 
 
 """
 Calculate a Preview Image
+runs as a job in Files_PreviewScheduler
 """
-class Files_CalculatePreview(QThread):
+class Files_CalculatePreview(QRunnable):
     m_File: str = ""
     m_PreviewHeight: int = 0                                  # size of the preview images... got from QTMediaViewer:m_PreviewHeight
-    m_Signal_Preview: pyqtSignal = pyqtSignal(QPixmap)      # signal for the preview image
-    m_Signal_MediaType: str = pyqtSignal(str)               # signal with the label of the image type
+    m_Levels: tuple = (64, 128, 256, 512, 1024)             # heights of our thumbnail pyramid
+    m_Cache: ThumbnailCache = None                          # persistent thumbnail cache... got from QTMediaViewer:m_Cache
+    m_Cancelled: bool = False                               # set by the scheduler, results are thrown away
+    m_Scheduler: QObject = None                             # scheduler that listens to m_Signal_Finished
+
+    def __init__(self):
+        QRunnable.__init__(self)
+        self.setAutoDelete(False)   # we reuse our jobs when zooming
+
+        self.m_Signals = Files_CalculatePreview_Signals()
+        self.m_Signal_Preview = self.m_Signals.m_Signal_Preview
+        self.m_Signal_Finished = self.m_Signals.m_Signal_Finished
 
     def run(self):
+        """ run the job and tell our scheduler that we are done """
+        try:
+            if not self.m_Cancelled:
+                self._Calculate()
+        finally:
+            self.m_Signal_Finished.emit(self.m_File)
+
+    @classmethod
+    def Level(cls, f_Height: int) -> int:
+        """
+        level of our thumbnail pyramid that is needed for a preview height
+        :param f_Height: preview height
+        :return: smallest level that is at least f_Height high
+        """
+        for _Level in cls.m_Levels:
+            if _Level >= f_Height:
+                return _Level
+        return f_Height
+
+    def _Calculate(self):
         """ try to create a preview from video.. if it fails we think it is a picture"""
         _MimeType = mimetypes.guess_type(self.m_File)[0]
+
+        # we calculate a whole pyramid level, zooming within the level is done by the gui
+        _Level = self.Level(self.m_PreviewHeight)
+
+        # warm cache: no need to touch the source file
+        _Key = ""
+        _Stat = None
+        if self.m_Cache is not None:
+            try:
+                _Stat = os.stat(self.m_File)
+            except OSError:
+                return
+            _Key = self.m_Cache.Key(self.m_File, _Level, _Stat)
+            _Data = self.m_Cache.Get(_Key)
+            if _Data is not None:
+                _Image = QImage.fromData(_Data)
+                if not _Image.isNull() and not self.m_Cancelled:
+                    self.m_Signal_Preview.emit(_Image)
+                    return
+
+        _Image = None
         if _MimeType.startswith('image'):
-            _Image = QImage(self.m_File, _MimeType.split("/")[1])
-            _Image = _Image.scaledToHeight(self.m_PreviewHeight, Qt.FastTransformation)
-            _Preview = QPixmap.fromImage(_Image)
-            self.m_Signal_Preview.emit(_Preview)
-            self.m_Signal_MediaType.emit("picture")
+            _Image = self.DecodeImage(self.m_File, _Level)
 
         if _MimeType.startswith('video'):
-            _Cap = cv2.VideoCapture(self.m_File)
-            _Cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            _, _Image = _Cap.retrieve()
-            rgb_image = cv2.cvtColor(_Image, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            _Image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            _Image = _Image.scaledToHeight(self.m_PreviewHeight, Qt.FastTransformation)
-
-            self.m_Signal_Preview.emit(QPixmap.fromImage(_Image))
-            self.m_Signal_MediaType.emit("video")
-            cv2.destroyAllWindows()
+            _Image = PosterFrame.Extract(self.m_File, _Level)
+
+        if _Image is None or _Image.isNull() or self.m_Cancelled:
+            return
+
+        self.m_Signal_Preview.emit(_Image)
+
+        # store our preview and all smaller levels for the next time
+        if self.m_Cache is not None:
+            self.m_Cache.Put(_Key, self.m_File, _Level, self._Encode(_Image))
+            for _Lower in self.m_Levels:
+                if _Lower >= _Level:
+                    break
+                _Lower_Key = self.m_Cache.Key(self.m_File, _Lower, _Stat)
+                if not self.m_Cache.Has(_Lower_Key):
+                    self.m_Cache.Put(_Lower_Key, self.m_File, _Lower, self._Encode(_Image.scaledToHeight(_Lower, Qt.SmoothTransformation)))
+
+    @staticmethod
+    def DecodeImage(f_File: str, f_Height: int) -> QImage:
+        """
+        decode a picture directly in (about) the preview height
+        jpeg gets scaled down while decoding, so a 24 MP photo never lands in memory in full size
+        falls back to a full decode if the reader can't tell the size of the picture
+        :param f_File: path to the picture
+        :param f_Height: height of the preview
+        :return: decoded image, null image on error
+        """
+        _Reader = QImageReader(f_File)
+        _Size = _Reader.size()
+        if _Size.isValid() and _Size.height() > f_Height:
+            _Reader.setScaledSize(QSize(max(1, round(_Size.width() * f_Height / _Size.height())), f_Height))
+            _Image = _Reader.read()
+            if not _Image.isNull():
+                return _Image
+
+            # reader is used up after a failed read
+            _Reader = QImageReader(f_File)
+
+        _Image = _Reader.read()
+        if _Image.isNull() or _Image.height() <= f_Height:
+            return _Image
+        return _Image.scaledToHeight(f_Height, Qt.FastTransformation)
+
+    @staticmethod
+    def _Encode(f_Image: QImage) -> bytes:
+        """
+        encode a preview as jpeg for the cache
+        :param f_Image: preview image
+        :return: encoded bytes
+        """
+        _Buffer = QBuffer()
+        _Buffer.open(QIODevice.WriteOnly)
+        f_Image.save(_Buffer, "JPG", 85)
+        return bytes(_Buffer.data())
+
+"""
+Scheduler for our preview jobs
+- bounded amount of workers
+- priority queue, lower number runs first
+- cancellation of queued and running jobs
+"""
+class Files_PreviewScheduler(QObject):
+    PRIORITY_VISIBLE: int = 0       # files that are currently in the viewport
+    PRIORITY_DEFAULT: int = 1       # everything else
+
+    def __init__(self, f_MaxWorkers: int = 0):
+        """
+        :param f_MaxWorkers: amount of worker threads, 0 for the amount of cores
+        """
+        QObject.__init__(self)
+        self.m_Pool = QThreadPool()
+        self.m_Pool.setMaxThreadCount(f_MaxWorkers if f_MaxWorkers > 0 else QThread.idealThreadCount())
+
+        self.m_Queue = []       # heap with [priority, sequence, file]
+        self.m_Sequence = 0     # keeps the order of files with the same priority
+        self.m_Pending = {}     # file -> [priority, job] for all queued jobs
+        self.m_Running = {}     # file -> job for all running jobs
+        self.m_Rerun = {}       # file -> [priority, job] for running files that got scheduled again, always the latest job
+
+    def Schedule(self, f_Job: Files_CalculatePreview, f_Priority: int = PRIORITY_DEFAULT):
+        """
+        queue a job, if the file is already queued only the priority gets updated
+        a new job for a queued or running file replaces the old one, it belongs to a model that is gone
+        :param f_Job: preview job
+        :param f_Priority: lower number runs first
+        """
+        f_Job.m_Cancelled = False
+        if f_Job.m_File in self.m_Running:
+            if self.m_Running[f_Job.m_File] is not f_Job:
+                self.m_Running[f_Job.m_File].m_Cancelled = True
+            self.m_Rerun[f_Job.m_File] = [f_Priority, f_Job]
+            return
+        if f_Job.m_File in self.m_Pending:
+            _Priority, _Job = self.m_Pending[f_Job.m_File]
+            if _Job is not f_Job:
+                _Job.m_Cancelled = True
+                self.m_Pending[f_Job.m_File][1] = f_Job
+            if _Priority <= f_Priority:
+                return
+
+        self.m_Pending[f_Job.m_File] = [f_Priority, f_Job]
+        self._Push(f_Priority, f_Job.m_File)
+        self._Dispatch()
+
+    def Prioritize(self, f_Files: list):
+        """
+        queued files of the viewport run first, all other queued files are moved behind them
+        :param f_Files: files that are currently in the viewport
+        """
+        _Visible = set(f_Files)
+        self.m_Queue = []
+        for _File, _Entry in self.m_Pending.items():
+            _Entry[0] = self.PRIORITY_VISIBLE if _File in _Visible else self.PRIORITY_DEFAULT
+            self._Push(_Entry[0], _File)
+        self._Dispatch()
+
+    def Cancel(self, f_File: str):
+        """
+        cancel a queued or running job
+        :param f_File: file of the job
+        """
+        if f_File in self.m_Pending:
+            self.m_Pending.pop(f_File)[1].m_Cancelled = True
+        if f_File in self.m_Running:
+            self.m_Running[f_File].m_Cancelled = True
+        if f_File in self.m_Rerun:
+            self.m_Rerun.pop(f_File)[1].m_Cancelled = True
+
+    def CancelAll(self):
+        """ cancel all jobs """
+        for _File in list(self.m_Pending) + list(self.m_Running):
+            self.Cancel(_File)
+        self.m_Queue = []
+
+    def _Push(self, f_Priority: int, f_File: str):
+        """ add an entry to our heap """
+        self.m_Sequence += 1
+        heapq.heappush(self.m_Queue, (f_Priority, self.m_Sequence, f_File))
+
+    def _Dispatch(self):
+        """ start queued jobs until all workers are busy """
+        while len(self.m_Running) < self.m_Pool.maxThreadCount() and len(self.m_Queue) > 0:
+            _Priority, _, _File = heapq.heappop(self.m_Queue)
+
+            # stale entry: cancelled, already started or reprioritized
+            if _File not in self.m_Pending or self.m_Pending[_File][0] != _Priority:
+                continue
+
+            _Job = self.m_Pending.pop(_File)[1]
+            self.m_Running[_File] = _Job
+            if _Job.m_Scheduler is not self:
+                _Job.m_Signal_Finished.connect(self._Finished)
+                _Job.m_Scheduler = self
+            self.m_Pool.start(_Job)
+
+    def _Finished(self, f_File: str):
+        """ a job is done, start the next one """
+        self.m_Running.pop(f_File, None)
+
+        # never the finished job, it may belong to a model that is gone
+        if f_File in self.m_Rerun:
+            _Priority, _Job = self.m_Rerun.pop(f_File)
+            self.Schedule(_Job, _Priority)
+        self._Dispatch()
 
 """
 Rename a File on the Fly
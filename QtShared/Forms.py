@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# Shared .ui forms of our widgets
+#
+# Used by QtCamera, QtMediaViewer and QtSnake.
+# uic.loadUi parses the xml of a form for every widget again. Here every
+# .ui file is compiled once per process and the form class is reused - a
+# folder with many headers or popups, every new game over screen and every
+# camera widget only pay for setupUi.
+# ---------------------------------------------------------------------------
+import os
+
+from PyQt5 import uic
+
+
+FORMS = {}                              # absolute path of the .ui file -> compiled form class
+
+
+def LoadForm(f_File: str, f_Widget):
+    """
+    like uic.loadUi, but the xml is only parsed for the first widget
+    :param f_File: path to the .ui file
+    :param f_Widget: widget that gets the form, all child widgets are set as its attributes
+    """
+    _File = os.path.abspath(f_File)
+    if _File not in FORMS:
+        FORMS[_File] = uic.loadUiType(_File)[0]
+    _Form = FORMS[_File]()
+    _Form.setupUi(f_Widget)
+    for _Name, _Value in vars(_Form).items():
+        setattr(f_Widget, _Name, _Value)
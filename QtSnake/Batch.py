@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# Many snake games at once with NumPy
+#
+# Same rules as Engine, but every step advances all boards with a few
+# array operations - made for agents and search that need a lot of games.
+# The snake body is not stored as a list: every cell keeps the step its
+# head entered it, a cell belongs to the snake as long as that is less
+# than the snake length ago. So the tail moves by itself and growing is
+# just a longer length.
+#
+# Needed Modules:
+# ```
+# pip install numpy
+# ```
+# ---------------------------------------------------------------------------
+import numpy as np
+
+
+""" N independent snake games advanced together """
+class BatchEngine:
+    m_Directions = "NESW"                                   # action i turns the snake to m_Directions[i]
+    m_Moves = np.array([[-1, 0], [0, 1], [1, 0], [0, -1]])  # move of the head per step for every direction
+    m_Fruit_Score = 10                                      # points for every fruit
+    m_Fruit_Tries = 8                                       # random picks for a free cell before we search the whole board
+
+    m_Empty = np.iinfo(np.int32).min // 2                   # entry step of a cell the snake never visited
+
+    def __init__(self, f_Boards: int, f_Grid=(25, 25), f_Seed: int = None):
+        """
+        :param f_Boards: amount of games
+        :param f_Grid: [rows, lines] like Engine, the board has 2 * n - 1 positions per axis
+        :param f_Seed: seed of the fruit placement, None for a random one
+        """
+        self.m_Grid = (f_Grid[0], f_Grid[1])
+        self.m_Rows = f_Grid[0] * 2 - 1
+        self.m_Lines = f_Grid[1] * 2 - 1
+        self.m_Random = np.random.default_rng(f_Seed)
+
+        self.m_Entered = np.empty((f_Boards, self.m_Rows, self.m_Lines), np.int32)   # step the head entered a cell
+        self.m_Head = np.empty((f_Boards, 2), np.int64)         # (row, line) of the head
+        self.m_Direction = np.empty(f_Boards, np.int8)          # index of m_Directions
+        self.m_Length = np.empty(f_Boards, np.int32)
+        self.m_Steps = np.empty(f_Boards, np.int32)             # steps done
+        self.m_Fruit = np.empty((f_Boards, 2), np.int64)        # (row, line) of the fruit, -1 if there is none
+        self.m_Score = np.empty(f_Boards, np.int64)
+        self.m_Over = np.empty(f_Boards, bool)
+        self.Reset()
+
+    def Reset(self, f_Boards=None):
+        """
+        start new games
+        :param f_Boards: indexes of the boards, None for all
+        """
+        _Boards = np.arange(len(self.m_Over)) if f_Boards is None else np.asarray(f_Boards, np.int64)
+        _Start = (self.m_Grid[1], self.m_Grid[0])       # we start in the middle
+
+        self.m_Entered[_Boards] = self.m_Empty
+        self.m_Entered[_Boards, _Start[0], _Start[1]] = 0
+        self.m_Head[_Boards] = _Start
+        self.m_Direction[_Boards] = 0
+        self.m_Length[_Boards] = 1
+        self.m_Steps[_Boards] = 0
+        self.m_Fruit[_Boards] = -1
+        self.m_Score[_Boards] = 0
+        self.m_Over[_Boards] = False
+
+    def Step(self, f_Actions=None) -> np.ndarray:
+        """
+        move every snake that is still alive one cell
+        :param f_Actions: direction per board (index of m_Directions), -1 or None to keep it,
+                          like Engine.Turn the snake can't turn back
+        :return: boards that ate a fruit in this step (bool per board)
+        """
+        if f_Actions is not None:
+            _Actions = np.asarray(f_Actions)
+            _Turn = (_Actions >= 0) & (_Actions != (self.m_Direction + 2) % 4) & ~self.m_Over
+            self.m_Direction[_Turn] = _Actions[_Turn]
+
+        _Ate = np.zeros(len(self.m_Over), bool)
+        _Boards = np.flatnonzero(~self.m_Over)
+        if len(_Boards) == 0:
+            return _Ate
+
+        _Head = self.m_Head[_Boards] + self.m_Moves[self.m_Direction[_Boards]]
+        _Row, _Line = _Head[:, 0], _Head[:, 1]
+        _Wall = (_Row < 0) | (_Row >= self.m_Rows) | (_Line < 0) | (_Line >= self.m_Lines)
+        _Row_In, _Line_In = np.clip(_Row, 0, self.m_Rows - 1), np.clip(_Line, 0, self.m_Lines - 1)
+        _Steps = self.m_Steps[_Boards]
+        _Length = self.m_Length[_Boards]
+
+        # the fruit of the last step may be eaten, a new one never lies under the head
+        _Fruit = self.m_Fruit[_Boards]
+        _Has_Fruit = _Fruit[:, 0] >= 0
+        _Eat = _Has_Fruit & (_Fruit[:, 0] == _Row) & (_Fruit[:, 1] == _Line)
+
+        # the cell of the tail is free if we don't grow, it moves away in this step
+        _Age = _Steps - self.m_Entered[_Boards, _Row_In, _Line_In]
+        _Body = ~_Wall & (_Age < _Length - np.where(_Eat, 0, 1))
+
+        # boards without a fruit get one on a free cell, before the tail moves
+        _Need = ~_Has_Fruit
+        if _Need.any():
+            self._PlaceFruit(_Boards[_Need], _Head[_Need])
+
+        # move the head, the tail follows by itself
+        _Inside = _Boards[~_Wall]
+        self.m_Steps[_Boards] = _Steps + 1
+        self.m_Entered[_Inside, _Row[~_Wall], _Line[~_Wall]] = _Steps[~_Wall] + 1
+        self.m_Head[_Boards] = _Head
+
+        _Eaten = _Boards[_Eat]
+        self.m_Length[_Eaten] += 1
+        self.m_Score[_Eaten] += self.m_Fruit_Score
+        self.m_Fruit[_Eaten] = -1
+        _Ate[_Eaten] = True
+
+        self.m_Over[_Boards[_Wall | _Body]] = True
+        return _Ate
+
+    def Occupancy(self) -> np.ndarray:
+        """ cells of the snakes (bool per board, row and line) """
+        return (self.m_Steps[:, None, None] - self.m_Entered) < self.m_Length[:, None, None]
+
+    def Snake(self, f_Board: int) -> list:
+        """
+        positions of a snake like Engine.m_Snake
+        :param f_Board: index of the board
+        :return: list of (row, line), head first
+        """
+        _Age = self.m_Steps[f_Board] - self.m_Entered[f_Board]
+        _Rows, _Lines = np.nonzero(_Age < self.m_Length[f_Board])
+        _Order = np.argsort(_Age[_Rows, _Lines], kind="stable")
+        return [(int(_Rows[i]), int(_Lines[i])) for i in _Order]
+
+    def _PlaceFruit(self, f_Boards: np.ndarray, f_Heads: np.ndarray):
+        """
+        put a fruit on a random free cell, every free cell has the same chance
+        :param f_Boards: indexes of the boards
+        :param f_Heads: new head of every board, it is not free anymore
+        """
+        _Fruit = np.full((len(f_Boards), 2), -1, np.int64)
+
+        # most cells are free: random picks until we hit one
+        _Todo = np.arange(len(f_Boards))
+        for _ in range(self.m_Fruit_Tries):
+            _Boards = f_Boards[_Todo]
+            _Row = self.m_Random.integers(0, self.m_Rows, len(_Todo))
+            _Line = self.m_Random.integers(0, self.m_Lines, len(_Todo))
+            _Free = (self.m_Steps[_Boards] - self.m_Entered[_Boards, _Row, _Line] >= self.m_Length[_Boards]) & \
+                    ((_Row != f_Heads[_Todo, 0]) | (_Line != f_Heads[_Todo, 1]))
+            _Fruit[_Todo[_Free], 0] = _Row[_Free]
+            _Fruit[_Todo[_Free], 1] = _Line[_Free]
+            _Todo = _Todo[~_Free]
+            if len(_Todo) == 0:
+                break
+
+        # nearly full boards: pick one of all free cells
+        for i in _Todo:
+            _Free = self.m_Steps[f_Boards[i]] - self.m_Entered[f_Boards[i]] >= self.m_Length[f_Boards[i]]
+            if 0 <= f_Heads[i, 0] < self.m_Rows and 0 <= f_Heads[i, 1] < self.m_Lines:
+                _Free[f_Heads[i, 0], f_Heads[i, 1]] = False
+            _Cells = np.flatnonzero(_Free)
+            if len(_Cells) > 0:
+                _Fruit[i] = divmod(int(self.m_Random.choice(_Cells)), self.m_Lines)
+
+        self.m_Fruit[f_Boards] = _Fruit
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# Snake engine without Qt
+#
+# All rules of the game: the snake moves one cell per tick, grows when it
+# eats the fruit and dies at the wall or when it bites itself. The fruit
+# is placed by our own random generator, so a game is defined by its grid,
+# its seed and the turns of the player. Log() returns exactly that and
+# Replay() plays it again as fast as possible - no display needed.
+# ---------------------------------------------------------------------------
+import random
+from array import array
+from collections import deque
+
+
+# all free cells of the board, occupy, free and sample are O(1)
+class FreeCells:
+
+    def __init__(self, f_Rows: int, f_Lines: int):
+        """
+        :param f_Rows: rows of the board
+        :param f_Lines: lines of the board
+        """
+        self.m_Rows = f_Rows
+        self.m_Lines = f_Lines
+        # cells are stored as row * lines + line, the first m_Count ones of m_Cells are free
+        self.m_Cells = array("l", range(f_Rows * f_Lines))
+        self.m_Index = array("l", range(f_Rows * f_Lines))     # cell -> position in m_Cells
+        self.m_Count = f_Rows * f_Lines
+
+    def Inside(self, f_Position) -> bool:
+        """ True if the position is on the board """
+        return 0 <= f_Position[0] < self.m_Rows and 0 <= f_Position[1] < self.m_Lines
+
+    def IsFree(self, f_Position) -> bool:
+        """ True if nothing occupies the cell, the position must be on the board """
+        return self.m_Index[f_Position[0] * self.m_Lines + f_Position[1]] < self.m_Count
+
+    def Occupy(self, f_Position):
+        """ mark a cell on the board as occupied """
+        _Cell = f_Position[0] * self.m_Lines + f_Position[1]
+        if self.m_Index[_Cell] < self.m_Count:
+            self.m_Count -= 1
+            self._Swap(self.m_Index[_Cell], self.m_Count)
+
+    def Free(self, f_Position):
+        """ mark a cell on the board as free """
+        _Cell = f_Position[0] * self.m_Lines + f_Position[1]
+        if self.m_Index[_Cell] >= self.m_Count:
+            self._Swap(self.m_Index[_Cell], self.m_Count)
+            self.m_Count += 1
+
+    def Sample(self, f_Random):
+        """
+        pick a free cell, every one has the same chance
+        :param f_Random: random number generator (random module or random.Random)
+        :return: (row, line) or None if the board is full
+        """
+        if self.m_Count == 0:
+            return None
+        return divmod(self.m_Cells[f_Random.randrange(self.m_Count)], self.m_Lines)
+
+    def _Swap(self, f_A: int, f_B: int):
+        """ swap two entries of m_Cells """
+        _Cell_A, _Cell_B = self.m_Cells[f_A], self.m_Cells[f_B]
+        self.m_Cells[f_A], self.m_Cells[f_B] = _Cell_B, _Cell_A
+        self.m_Index[_Cell_A], self.m_Index[_Cell_B] = f_B, f_A
+
+
+""" rules and state of one snake game """
+class Engine:
+    m_Directions = {"N": (-1, 0), "E": (0, 1), "S": (1, 0), "W": (0, -1)}  # move of the head per tick
+    m_Opposite = {"N": "S", "E": "W", "S": "N", "W": "E"}
+    m_Fruit_Score = 10                      # points for every fruit
+
+    def __init__(self, f_Grid=(25, 25), f_Seed: int = None):
+        """
+        :param f_Grid: [rows, lines] like Game.m_GameBoard_Grid, the board has 2 * n - 1 positions per axis
+        :param f_Seed: seed of the fruit placement, None for a random one
+        """
+        self.m_Grid = (f_Grid[0], f_Grid[1])
+        self.m_Seed = f_Seed if f_Seed is not None else random.randrange(2 ** 32)
+        self.m_Random = random.Random(self.m_Seed)
+
+        self.m_Free = FreeCells(self.m_Grid[0] * 2 - 1, self.m_Grid[1] * 2 - 1)
+        self.m_Snake = deque()                  # positions of all snake elements (row, line), head first
+        self.m_Fruit = ()                       # position of the fruit, empty if there is none
+        self.m_Direction = "N"                  # N/E/S/W
+        self.m_Score = 0
+        self.m_Ticks = 0                        # steps done
+        self.m_Over = False
+        self.m_Inputs = []                      # [tick, direction] of every turn
+
+        # we start in the middle
+        _Start = (self.m_Grid[1], self.m_Grid[0])
+        self.m_Snake.append(_Start)
+        self.m_Free.Occupy(_Start)
+
+    def Turn(self, f_Direction: str) -> bool:
+        """
+        change the direction for the next step, the snake can't turn back
+        :param f_Direction: N/E/S/W
+        :return: True if the direction was changed
+        """
+        if self.m_Over or f_Direction == self.m_Direction or f_Direction == self.m_Opposite[self.m_Direction]:
+            return False
+        self.m_Direction = f_Direction
+        self.m_Inputs.append([self.m_Ticks, f_Direction])
+        return True
+
+    def Step(self) -> list:
+        """
+        move the snake one cell
+        :return: changed cells [(row, line), kind], kind is "snake", "fruit" or "" for an empty cell
+        """
+        if self.m_Over:
+            return []
+        self.m_Ticks += 1
+        _Changes = []
+
+        # we add a snake element to our start of the snake list based on the direction
+        _Move = self.m_Directions[self.m_Direction]
+        _Head = (self.m_Snake[0][0] + _Move[0], self.m_Snake[0][1] + _Move[1])
+        _Wall = not self.m_Free.Inside(_Head)
+        _Body = not _Wall and not self.m_Free.IsFree(_Head)
+        if not _Wall:
+            self.m_Free.Occupy(_Head)
+        self.m_Snake.appendleft(_Head)
+        _Changes.append([_Head, "snake"])
+
+        # check if we need a fruit, it is placed on a random free cell
+        if len(self.m_Fruit) == 0:
+            self.m_Fruit = self.m_Free.Sample(self.m_Random) or ()
+            if len(self.m_Fruit) > 0:
+                _Changes.append([self.m_Fruit, "fruit"])
+
+        # the last element disappears except we ate the fruit
+        if self.m_Fruit == _Head:
+            self.m_Score += self.m_Fruit_Score
+            self.m_Fruit = ()
+        else:
+            _Tail = self.m_Snake.pop()
+            if _Tail == _Head:      # the head moved into the old tail, that's allowed
+                _Body = False
+            else:
+                self.m_Free.Free(_Tail)
+                _Changes.append([_Tail, ""])
+
+        # eaten by itself or hit the wall
+        if _Body or _Wall:
+            self.m_Over = True
+        return _Changes
+
+    def Log(self) -> dict:
+        """ everything needed to replay this game, can be stored as json """
+        return {"grid": list(self.m_Grid), "seed": self.m_Seed, "ticks": self.m_Ticks, "inputs": [list(i) for i in self.m_Inputs]}
+
+    @classmethod
+    def Replay(cls, f_Log: dict, f_Ticks: int = None):
+        """
+        play a logged game again as fast as possible
+        :param f_Log: result of Log()
+        :param f_Ticks: stop after this many ticks, None for all of the log
+        :return: engine in the state after the last tick
+        """
+        _Engine = cls(f_Log["grid"], f_Log["seed"])
+        _Ticks = f_Log["ticks"] if f_Ticks is None else f_Ticks
+        _Inputs = iter(f_Log["inputs"])
+        _Next = next(_Inputs, None)
+        while _Engine.m_Ticks < _Ticks and not _Engine.m_Over:
+            while _Next is not None and _Next[0] <= _Engine.m_Ticks:
+                _Engine.Turn(_Next[1])
+                _Next = next(_Inputs, None)
+            _Engine.Step()
+        return _Engine
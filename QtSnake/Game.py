@@ -5,135 +5,200 @@
 #
 # Game widget in snake style
 # Made for fun and learning effect
+# The rules are in Engine, this widget only draws and takes the keys
 # Have fun !
 # ---------------------------------------------------------------------------
-import random
+import os
 
-from PyQt5 import QtCore, QtGui, QtWidgets, uic
+from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import QTimer, pyqtSignal
 
+from .Engine import Engine
+
+# every .ui file is compiled once per process
+try:
+    from ..QtShared.Forms import LoadForm
+except:
+    from QtShared.Forms import LoadForm
+
+# board of the game, all cells are drawn by one QPainter
+class GameBoard(QtWidgets.QWidget):
+
+    # config variables
+    m_Colors = {"fruit": "#cc1100",         # color of every cell kind, drawn in this order
+                "snake": "#a8ea6a"}
+    m_Background = "#FFF"
+
+    def __init__(self, f_Parent, f_Grid):
+        """
+        :param f_Parent: widget we are drawn on
+        :param f_Grid: [rows, lines] of the game
+        """
+        QtWidgets.QWidget.__init__(self, f_Parent)
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent)    # we paint every pixel, the parent doesn't need to
+
+        self.m_Grid = f_Grid
+        self.m_Cells = {}                   # (row, line) -> kind of all cells we draw
+        self.m_Step = [0.0, 0.0]            # [height, width] between two positions, a cell is two steps big
+
+        # brushes are created once and not for every paint event
+        self.m_Brushes = {_Kind: QtGui.QBrush(QtGui.QColor(_Color)) for _Kind, _Color in self.m_Colors.items()}
+        self.m_Brush_Background = QtGui.QBrush(QtGui.QColor(self.m_Background))
+
+    def SetCell(self, f_Position, f_Kind: str):
+        """
+        draw a cell
+        :param f_Position: [row, line] of the cell
+        :param f_Kind: key of m_Colors
+        """
+        _Key = (f_Position[0], f_Position[1])
+        if self.m_Cells.get(_Key) != f_Kind:
+            self.m_Cells[_Key] = f_Kind
+            self.update(self._CellRect(_Key).toAlignedRect())
+
+    def ClearCell(self, f_Position):
+        """ remove a cell """
+        _Key = (f_Position[0], f_Position[1])
+        if self.m_Cells.pop(_Key, None) is not None:
+            self.update(self._CellRect(_Key).toAlignedRect())
+
+    def Clear(self):
+        """ remove all cells """
+        self.m_Cells.clear()
+        self.update()
+
+    def _CellRect(self, f_Key) -> QtCore.QRectF:
+        """ area of a cell in pixels """
+        return QtCore.QRectF(f_Key[1] * self.m_Step[1], f_Key[0] * self.m_Step[0], self.m_Step[1] * 2, self.m_Step[0] * 2)
+
+    def Reset(self, f_Grid):
+        """
+        remove all cells and use another grid
+        :param f_Grid: [rows, lines] of the game
+        """
+        self.m_Grid = f_Grid
+        self.m_Cells.clear()
+        self.resizeEvent(None)
+
+    def resizeEvent(self, e):
+        """ the cells grow with the board """
+        self.m_Step = [self.height() / self.m_Grid[0] / 2, self.width() / self.m_Grid[1] / 2]
+        self.update()
+
+    def paintEvent(self, e):
+        """ draw the background and the cells of the dirty area only """
+        _Painter = QtGui.QPainter(self)
+        _Cells = {_Kind: [] for _Kind in self.m_Colors}
+        for _Rect in e.region().rects():
+            _Painter.fillRect(_Rect, self.m_Brush_Background)
+            if self.m_Step[0] <= 0 or self.m_Step[1] <= 0:
+                continue
+
+            # cells that overlap the rect, a cell covers its own and the next position
+            _Row_Min, _Row_Max = int(_Rect.top() / self.m_Step[0]) - 1, int(_Rect.bottom() / self.m_Step[0])
+            _Line_Min, _Line_Max = int(_Rect.left() / self.m_Step[1]) - 1, int(_Rect.right() / self.m_Step[1])
+            if (_Row_Max - _Row_Min + 1) * (_Line_Max - _Line_Min + 1) > len(self.m_Cells):
+                _Keys = [k for k in self.m_Cells if _Row_Min <= k[0] <= _Row_Max and _Line_Min <= k[1] <= _Line_Max]
+            else:
+                _Keys = [(r, l) for r in range(_Row_Min, _Row_Max + 1) for l in range(_Line_Min, _Line_Max + 1) if (r, l) in self.m_Cells]
+            for _Key in _Keys:
+                _Cells[self.m_Cells[_Key]].append(_Key)
+
+        for _Kind, _Keys in _Cells.items():
+            _Brush = self.m_Brushes[_Kind]
+            for _Key in _Keys:
+                _Painter.fillRect(self._CellRect(_Key), _Brush)
+
 # game over widget
 class GameOver(QtWidgets.QWidget):
     def __init__(self):
         QtWidgets.QWidget.__init__(self)
-        uic.loadUi('QtSnake/Interface/GameOver.ui', self)
+        LoadForm(os.path.dirname(os.path.realpath(__file__)) + '/Interface/GameOver.ui', self)
 
     def Score(self, f_Text):
         """ change score text """
         self.label_Score.setText(str(f_Text))
 
 class Game(QtWidgets.QWidget):
+    m_Keys = {QtCore.Qt.Key_Up: "N", QtCore.Qt.Key_Right: "E", QtCore.Qt.Key_Down: "S", QtCore.Qt.Key_Left: "W"}
 
     def __init__(self):
         QtWidgets.QWidget.__init__(self)
-        uic.loadUi('QtSnake/Interface/GameBoard.ui', self)
+        LoadForm(os.path.dirname(os.path.realpath(__file__)) + '/Interface/GameBoard.ui', self)
 
         # define some config variables
         self.m_Score = 0                    # store the current score
-        self.m_Game_Speed = 50              # timer in milliseconds
+        self.m_Game_Speed = 50              # milliseconds per step
+        self.m_Max_Catchup = 5              # steps we may do at once after a stall, further ones are dropped
         self.m_GameBoard_Grid = [25, 25]    # rows and lines
 
         # define some class vars
         self.m_GameBoard_Frame = [0, 0]         # [height, width]
         self.m_GameBoard_GridField = [0, 0]     # [height, width]
-        self.m_Snake_Direction = "N"            # N/E/S/W
-        self.m_Snake = []                       # grid positions of all snake elements [x, y]
-        self.m_Snake_Labels = []                # stores all snake elements
-        self.m_Fruits = []                      # grid positions of all fruit elements [x, y]
-        self.m_Fruits_Labels = []               # stores all fruit elements
+        self.m_Engine = None                    # rules and state of the current game
+        self.m_GameOver = None                  # GameOver widget of the last game
+        self.m_Lag = 0                          # milliseconds we are behind our steps
+        self.m_Clock = QtCore.QElapsedTimer()
+        self.m_Board = GameBoard(self.frame_GameBoard, self.m_GameBoard_Grid)
 
         # connect and calculate resize event for frame
         self.frame_GameBoard.resizeEvent = lambda e: self._CalculateGameBoard()
         self._CalculateGameBoard()
 
-        # start the game
+        # the timer only looks at the clock, steps are done in a fixed timestep
         self.m_Snake_Timer = QTimer()
-        self.m_Snake_Timer.timeout.connect(self._Game)
-        self.m_Snake_Timer.start(self.m_Game_Speed)
+        self.m_Snake_Timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.m_Snake_Timer.timeout.connect(self._Loop)
+
+        # start the game
+        self.NewGame()
+
+    def NewGame(self, f_Seed: int = None):
+        """
+        start a new game with the current m_GameBoard_Grid
+        :param f_Seed: seed of the fruit placement, None for a random one
+        """
+        if self.m_GameOver is not None:
+            self.m_GameOver.deleteLater()
+            self.m_GameOver = None
+        self.m_Engine = Engine(self.m_GameBoard_Grid, f_Seed)
+        self.m_Board.Reset(self.m_GameBoard_Grid)
+        self.m_Score = 0
+        self._UpdateScore(0)
+
+        self.m_Lag = 0
+        self.m_Clock.start()
+        self.m_Snake_Timer.start(max(1, self.m_Game_Speed // 4))
+
+    def _Loop(self):
+        """
+        do all steps that are due since the last call, so the speed stays
+        the same when our timer is late
+        """
+        self.m_Lag += self.m_Clock.restart()
+        _Steps = 0
+        while self.m_Lag >= self.m_Game_Speed and not self.m_Engine.m_Over:
+            if _Steps == self.m_Max_Catchup:
+                self.m_Lag = 0
+                break
+            self.m_Lag -= self.m_Game_Speed
+            _Steps += 1
+            self._Game()
 
     def _Game(self):
         """
-        Start our snake game
-        """
-        # if we have no snake element we start in the middle
-        if len(self.m_Snake) == 0:
-            _X = self.m_GameBoard_Grid[1]
-            _Y = self.m_GameBoard_Grid[0]
-            self.m_Snake.append([_X, _Y])
-
-        # clear frame before we update the frame
-        for _Item in self.m_Snake_Labels:
-            _Item.deleteLater()
-        self.m_Snake_Labels = []
-
-        for _Item in self.m_Fruits_Labels:
-            _Item.deleteLater()
-        self.m_Fruits_Labels = []
-
-        # we add a snake element to our start of the snake list based on the direction
-        if self.m_Snake_Direction == "N":
-            _Element = self.m_Snake[0]
-            self.m_Snake.insert(0, [_Element[0] - 1, _Element[1]])
-        elif self.m_Snake_Direction == "E":
-            _Element = self.m_Snake[0]
-            self.m_Snake.insert(0, [_Element[0], _Element[1] + 1])
-        elif self.m_Snake_Direction == "S":
-            _Element = self.m_Snake[0]
-            self.m_Snake.insert(0, [_Element[0] + 1, _Element[1]])
-        elif self.m_Snake_Direction == "W":
-            _Element = self.m_Snake[0]
-            self.m_Snake.insert(0, [_Element[0] , _Element[1] - 1])
-
-        # check if we need a fruit
-        if len(self.m_Fruits) == 0:
-            while True:
-                # generate random coords
-                _X = random.randint(0, self.m_GameBoard_Grid[1])
-                _Y = random.randint(0, self.m_GameBoard_Grid[0])
-                self.m_Fruits = [_X, _Y]
-                # check if we collide instantly with a snake tile
-                if [_X, _Y] not in self.m_Snake:
-                    break
-
-        # print our fruit
-        _Fruit = QtWidgets.QLabel(self.frame_GameBoard)
-        _Fruit.setStyleSheet("border: 0px solid #A2A2A2; background: #cc1100;")
-        _Fruit.setFixedHeight(self.m_GameBoard_GridField[0])
-        _Fruit.setFixedWidth(self.m_GameBoard_GridField[1])
-        _Fruit.show()
-
-        _X = self.m_Fruits[1] / 2 * self.m_GameBoard_GridField[1]
-        _Y = self.m_Fruits[0] / 2 * self.m_GameBoard_GridField[0]
-        _Fruit.move(_X, _Y)
-
-        self.m_Fruits_Labels.append(_Fruit)
-
-        # print our snake
-        for _i, _Grid in enumerate(self.m_Snake):
-            _Snake = QtWidgets.QLabel(self.frame_GameBoard)
-            _Snake.setStyleSheet("border: 0px solid #A2A2A2; background: #a8ea6a;")
-            _Snake.setFixedHeight(self.m_GameBoard_GridField[0])
-            _Snake.setFixedWidth(self.m_GameBoard_GridField[1])
-            _Snake.show()
-
-            _X = _Grid[1] / 2 * self.m_GameBoard_GridField[1]
-            _Y = _Grid[0] / 2 * self.m_GameBoard_GridField[0]
-            _Snake.move(_X, _Y)
-
-            self.m_Snake_Labels.append(_Snake)
-
-        # delete last element of the snake list... this disappears
-        # except we collide with a fruit
-        if self.m_Fruits in self.m_Snake:
-            self._UpdateScore(10)
-            self.m_Fruits = []
-        else:
-            self.m_Snake.pop()
-
-        # eaten by itself
-        if self.m_Snake[0] in self.m_Snake[1:] or \
-                self.m_Snake[0][0] == -1 or self.m_Snake[0][1] == -1 or \
-                self.m_Snake[0][0] == (self.m_GameBoard_Grid[0]*2)-1 or self.m_Snake[0][1] == (self.m_GameBoard_Grid[1]*2)-1:
+        one step of our snake game
+        """
+        for _Position, _Kind in self.m_Engine.Step():
+            if _Kind == "":
+                self.m_Board.ClearCell(_Position)
+            else:
+                self.m_Board.SetCell(_Position, _Kind)
+
+        if self.m_Engine.m_Score != self.m_Score:
+            self._UpdateScore(self.m_Engine.m_Score - self.m_Score)
+
+        if self.m_Engine.m_Over:
             self.m_Snake_Timer.stop()
             self._GameOver()
 
@@ -141,9 +206,9 @@ class Game(QtWidgets.QWidget):
         """
         sorry! GameOver
         """
-        _GameOver = GameOver()
-        _GameOver.Score("Deine Punkte: {}".format(self.m_Score))
-        self.layout_GameBoard.addWidget(_GameOver)
+        self.m_GameOver = GameOver()
+        self.m_GameOver.Score("Deine Punkte: {}".format(self.m_Score))
+        self.layout_GameBoard.addWidget(self.m_GameOver)
 
     def _UpdateScore(self, f_Add):
         """
@@ -169,15 +234,12 @@ class Game(QtWidgets.QWidget):
         _Grid_Width = _Frame_Width / self.m_GameBoard_Grid[1]
         self.m_GameBoard_GridField = [_Grid_Height, _Grid_Width]
 
+        # the board covers the frame but not its border
+        self.m_Board.setGeometry(self.frame_GameBoard.contentsRect())
+
     def keyPressEvent(self, e):
         """ rewrite keypressevent to control our snake """
         super(Game, self).keyPressEvent(e)
 
-        if e.key() == QtCore.Qt.Key_Up and self.m_Snake_Direction != "S":
-            self.m_Snake_Direction = "N"
-        if e.key() == QtCore.Qt.Key_Right and self.m_Snake_Direction != "W":
-            self.m_Snake_Direction = "E"
-        if e.key() == QtCore.Qt.Key_Down and self.m_Snake_Direction != "N":
-            self.m_Snake_Direction = "S"
-        if e.key() == QtCore.Qt.Key_Left and self.m_Snake_Direction != "E":
-            self.m_Snake_Direction = "W"
+        if e.key() in self.m_Keys:
+            self.m_Engine.Turn(self.m_Keys[e.key()])
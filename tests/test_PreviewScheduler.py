@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Created By  : Bernhard Hofer  -   Mail@Bernhard-Hofer.at
+#
+# Tests of the preview scheduler of QtMediaViewer
+#
+# python -m pytest tests
+# ---------------------------------------------------------------------------
+import os
+import sys
+import time
+import threading
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication
+
+from QtMediaViewer.Threads import Files_CalculatePreview, Files_PreviewScheduler
+
+
+m_App = QApplication.instance() or QApplication([])
+
+
+""" preview job that waits for the test before it delivers its preview """
+class BlockingPreview(Files_CalculatePreview):
+
+    def __init__(self, f_File: str):
+        Files_CalculatePreview.__init__(self)
+        self.m_File = f_File
+        self.m_Started = threading.Event()
+        self.m_Release = threading.Event()
+        self.m_Previews = []
+        self.m_Signal_Preview.connect(self.m_Previews.append)
+
+    def _Calculate(self):
+        self.m_Started.set()
+        self.m_Release.wait(5)
+        if not self.m_Cancelled:
+            self.m_Signal_Preview.emit(QImage(1, 1, QImage.Format_RGB32))
+
+
+def _Wait(f_Condition, f_Timeout: float = 5.0) -> bool:
+    """ process queued signals until f_Condition() is true """
+    _End = time.monotonic() + f_Timeout
+    while time.monotonic() < _End:
+        QCoreApplication.processEvents()
+        if f_Condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_replacement_job_of_a_running_file():
+    """ a new job for a file that is still running replaces the old one, only the new job delivers """
+    _Scheduler = Files_PreviewScheduler(1)
+    _Old = BlockingPreview("/media/a.jpg")
+    _Scheduler.Schedule(_Old)
+    assert _Old.m_Started.wait(5)
+
+    _New = BlockingPreview("/media/a.jpg")
+    _New.m_Release.set()
+    _Scheduler.Schedule(_New)
+    _Old.m_Release.set()
+
+    assert _Wait(lambda: len(_New.m_Previews) > 0)
+    assert _Wait(lambda: len(_Scheduler.m_Running) == 0 and len(_Scheduler.m_Pending) == 0)
+    assert _Old.m_Previews == []
+    assert len(_New.m_Previews) == 1
+
+
+def test_replacement_job_after_reload():
+    """ CancelAll() and a new job while the old one still runs: the new model gets its preview """
+    _Scheduler = Files_PreviewScheduler(1)
+    _Old = BlockingPreview("/media/a.jpg")
+    _Scheduler.Schedule(_Old)
+    assert _Old.m_Started.wait(5)
+
+    _Scheduler.CancelAll()
+    _New = BlockingPreview("/media/a.jpg")
+    _New.m_Release.set()
+    _Scheduler.Schedule(_New)
+    _Old.m_Release.set()
+
+    assert _Wait(lambda: len(_New.m_Previews) > 0)
+    assert _Wait(lambda: len(_Scheduler.m_Running) == 0)
+    assert _Old.m_Previews == []